@@ -7,72 +7,368 @@ This module implements multiple caching strategies beyond LRU:
 - FIFO (First In First Out)
 - Adaptive Caching (switches between strategies based on performance)
 
+Every strategy can optionally sit behind a TinyLFU admission filter
+(tinylfu=True), which only admits a new item when its estimated access
+frequency is not lower than that of the item it would evict.
+
+LRUCache can also be bounded by total content size (capacity_bytes), in
+which case new content is admitted with the size-aware AdaptSize
+probability exp(-size / c), with c tuned online for the best hit rate.
+
 Team Members:
 1. Neha (U25UV23T064063)
 2. Sanjana C K (U25UV22T064049)
 """
 
-from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime
-import time
+from sys import intern
+import math
+import random
+import numpy as np
 
-@dataclass
+# Sentinel for single-probe dict lookups (cached items are never this object)
+_MISS = object()
+
+@dataclass(slots=True)
 class CacheItem:
     """Cache item with metadata"""
     content_id: str
     content: Any
     access_count: int = 0
-    last_access_time: float = 0.0
-    insert_time: float = 0.0
+    # Logical clock ticks of the owning cache (ordering only, not wall time)
+    last_access_time: int = 0
+    insert_time: int = 0
+    size: int = 0
+    
+    def recycle(self, content_id: str, content: Any, tick: int, size: int = 0) -> 'CacheItem':
+        """Re-initialise an evicted item in place so it can hold new content"""
+        self.content_id = content_id
+        self.content = content
+        self.access_count = 0
+        self.last_access_time = tick
+        self.insert_time = tick
+        self.size = size
+        return self
 
-class LRUCache:
-    """Least Recently Used Cache Implementation"""
+class _FrequencyList:
+    """
+    LFU frequency buckets indexed directly by access count.
+    
+    buckets[f] holds the items accessed f times, in the order they reached
+    that count (LRU tie-break). Counts saturate at MAX_FREQUENCY, which keeps
+    the bucket list short; beyond it, items only refresh their position in
+    the top bucket. The frequency list owns CacheItem.access_count.
+    """
+    __slots__ = ('buckets', 'min_frequency')
+    
+    MAX_FREQUENCY = 255
+    
+    def __init__(self):
+        self.buckets: List[Dict[str, CacheItem]] = [{}, {}]  # index 0 unused
+        self.min_frequency = 1
+    
+    def add(self, item: CacheItem):
+        """Insert a new item with frequency 1"""
+        item.access_count = 1
+        self.buckets[1][item.content_id] = item
+        self.min_frequency = 1
+    
+    def touch(self, item: CacheItem):
+        """Count one more access of an item"""
+        buckets = self.buckets
+        content_id = item.content_id
+        freq = item.access_count
+        item.access_count = freq + 1
+        if freq >= self.MAX_FREQUENCY:
+            bucket = buckets[self.MAX_FREQUENCY]
+            del bucket[content_id]
+            bucket[content_id] = item
+            return
+        bucket = buckets[freq]
+        del bucket[content_id]
+        if not bucket and freq == self.min_frequency:
+            self.min_frequency = freq + 1
+        freq += 1
+        if freq == len(buckets):
+            buckets.append({})
+        buckets[freq][content_id] = item
+    
+    def remove(self, item: CacheItem):
+        """Drop an item from its bucket"""
+        del self.buckets[min(item.access_count, self.MAX_FREQUENCY)][item.content_id]
+    
+    def peek_victim(self) -> CacheItem:
+        """Return the least recently used item of the lowest frequency"""
+        buckets = self.buckets
+        freq = self.min_frequency
+        # remove() may leave min_frequency on an emptied bucket
+        while not buckets[freq]:
+            freq += 1
+        self.min_frequency = freq
+        items = buckets[freq]
+        return items[next(iter(items))]
+
+class CountMinSketch:
+    """
+    Count-min sketch of recent access frequencies (TinyLFU admission filter).
+    
+    Four rows of 16-bit counters; a key's estimate is the minimum of its four
+    counters. All counters are halved after every sample_size additions so
+    that old popularity fades out.
+    """
+    __slots__ = ('mask', 'table', 'additions', 'sample_size')
+    
+    DEPTH = 4
+    _ROWS = np.arange(DEPTH)
+    # Odd multipliers that spread the same string hash differently per row
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
     
     def __init__(self, capacity: int):
+        # Roughly 8 counters per cached item, rounded up to a power of two
+        width = 1 << max(4, (max(1, capacity) * 8 - 1).bit_length())
+        self.mask = width - 1
+        self.table = np.zeros((self.DEPTH, width), dtype=np.uint16)
+        self.additions = 0
+        # Kept below 2**15 so counters can never overflow between agings
+        self.sample_size = min(10 * width, 0x7FFF)
+    
+    def _indexes(self, content_id: str) -> list:
+        h = hash(content_id)
+        mask = self.mask
+        return [((h * seed) >> 16) & mask for seed in self._SEEDS]
+    
+    def add(self, content_id: str):
+        """Record one access of content_id"""
+        self.table[self._ROWS, self._indexes(content_id)] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table >>= 1
+            self.additions //= 2
+    
+    def estimate(self, content_id: str) -> int:
+        """Estimated number of recent accesses of content_id"""
+        return int(self.table[self._ROWS, self._indexes(content_id)].min())
+    
+    def admit(self, candidate_id: str, victim_id: str) -> bool:
+        """Whether candidate_id should replace victim_id in a full cache"""
+        return self.estimate(candidate_id) >= self.estimate(victim_id)
+
+class _CacheBase:
+    """Batch operations and derived statistics shared by all cache strategies"""
+    __slots__ = ()
+    
+    def get_many(self, content_ids: List[str]) -> List[Optional[Any]]:
+        """Get several contents in one call; misses come back as None"""
+        get = self.get
+        return [get(content_id) for content_id in content_ids]
+    
+    def put_many(self, items: Iterable[Tuple]):
+        """Add several (content_id, content) or (content_id, content, size) entries in one call"""
+        put = self.put
+        for entry in items:
+            put(*entry)
+    
+    @property
+    def hit_rate(self) -> float:
+        """Hit rate in percent (0 before the first request)"""
+        return self.hits * 100.0 / max(1, self.hits + self.misses)
+    
+    @property
+    def utilization(self) -> float:
+        """Occupied share of the capacity in percent"""
+        return len(self.cache) * 100.0 / self.capacity if self.capacity > 0 else 0
+
+class LRUCache(_CacheBase):
+    """
+    Least Recently Used Cache Implementation
+    
+    With capacity_bytes set, the cache is also bounded by the total size
+    passed to put() and admits new content through AdaptSize.
+    """
+    __slots__ = (
+        'capacity', 'cache', 'hits', 'misses', 'evictions', 'bytes_used', '_tick', 'admission',
+        'capacity_bytes', 'rejections', '_adapt_c', '_adapt_direction',
+        '_adapt_last_rate', '_adapt_hits', '_adapt_misses', '_next_adapt'
+    )
+    
+    # AdaptSize tuning: re-evaluate c every ADAPT_INTERVAL requests,
+    # scaling it by ADAPT_STEP in the direction that last improved hit rate
+    ADAPT_INTERVAL = 500
+    ADAPT_STEP = 1.25
+    
+    strategy = 'LRU'
+    
+    def __init__(self, capacity: int, tinylfu: bool = False, capacity_bytes: Optional[int] = None):
         self.capacity = capacity
-        self.cache: OrderedDict[str, CacheItem] = OrderedDict()
+        self.cache: Dict[str, CacheItem] = {}
         self.hits = 0
         self.misses = 0
         self.evictions = 0
+        self.bytes_used = 0
+        self._tick = 0
+        self.admission = CountMinSketch(capacity) if tinylfu else None
+        
+        # Size-aware mode (AdaptSize)
+        self.capacity_bytes = capacity_bytes
+        self.rejections = 0
+        if capacity_bytes is not None:
+            # Start from the average slot size; tuning takes it from there
+            self._adapt_c = capacity_bytes / max(1, capacity)
+            self._adapt_direction = 1
+            self._adapt_last_rate = 0.0
+            self._adapt_hits = 0
+            self._adapt_misses = 0
+            self._next_adapt = self.ADAPT_INTERVAL
     
     def get(self, content_id: str) -> Optional[Any]:
         """Get content from cache"""
-        if content_id in self.cache:
-            # Move to end (most recently used)
-            item = self.cache[content_id]
-            item.last_access_time = time.time()
-            self.cache.move_to_end(content_id)
-            self.hits += 1
-            return item.content
-        self.misses += 1
-        return None
+        cache = self.cache
+        if self.admission is not None:
+            self.admission.add(content_id)
+        item = cache.pop(content_id, _MISS)
+        if item is _MISS:
+            self.misses += 1
+            return None
+        # Re-insert at the end (most recently used)
+        self._tick += 1
+        item.last_access_time = self._tick
+        cache[content_id] = item
+        self.hits += 1
+        return item.content
     
-    def put(self, content_id: str, content: Any):
-        """Add content to cache"""
-        current_time = time.time()
+    def get_many(self, content_ids: List[str]) -> List[Optional[Any]]:
+        """Get several contents in one call; misses come back as None"""
+        cache = self.cache
+        admission = self.admission
+        results = [None] * len(content_ids)
+        hits = 0
+        tick = self._tick
+        for i, content_id in enumerate(content_ids):
+            if admission is not None:
+                admission.add(content_id)
+            item = cache.pop(content_id, _MISS)
+            if item is not _MISS:
+                tick += 1
+                item.last_access_time = tick
+                cache[content_id] = item
+                results[i] = item.content
+                hits += 1
+        self._tick = tick
+        self.hits += hits
+        self.misses += len(content_ids) - hits
+        return results
+    
+    def put(self, content_id: str, content: Any, size: int = 0):
+        """Add content to cache (size only matters when capacity_bytes is set)"""
+        # Stored keys are interned so later lookups hit the identity fast path
+        content_id = intern(content_id)
+        if self.capacity_bytes is not None:
+            self._put_sized(content_id, content, size)
+            return
+        cache = self.cache
+        admission = self.admission
+        if admission is not None:
+            admission.add(content_id)
+        self._tick += 1
+        current_time = self._tick
         
-        if content_id in self.cache:
+        item = cache.pop(content_id, _MISS)
+        if item is not _MISS:
             # Update existing
-            item = self.cache[content_id]
+            item.content = content
+            self.bytes_used += size - item.size
+            item.size = size
             item.last_access_time = current_time
-            self.cache.move_to_end(content_id)
+            cache[content_id] = item
         else:
             # Check if cache is full
-            if len(self.cache) >= self.capacity:
-                # Remove least recently used (first item)
-                self.cache.popitem(last=False)
+            if len(cache) >= self.capacity:
+                # Remove least recently used (first item), unless TinyLFU rejects the newcomer
+                victim_id = next(iter(cache))
+                if admission is not None and not admission.admit(content_id, victim_id):
+                    return
+                # Reuse the evicted item's object instead of allocating a new one
+                victim = cache.pop(victim_id)
+                self.bytes_used -= victim.size
+                item = victim.recycle(content_id, content, current_time, size)
                 self.evictions += 1
-            
-            # Add new content
+            else:
+                item = CacheItem(
+                    content_id=content_id,
+                    content=content,
+                    last_access_time=current_time,
+                    insert_time=current_time,
+                    size=size
+                )
+            cache[content_id] = item
+            self.bytes_used += size
+    
+    def _put_sized(self, content_id: str, content: Any, size: int):
+        """put() for a byte-bounded cache with AdaptSize admission"""
+        cache = self.cache
+        admission = self.admission
+        if admission is not None:
+            admission.add(content_id)
+        if self.hits + self.misses >= self._next_adapt:
+            self._tune_adaptsize()
+        self._tick += 1
+        current_time = self._tick
+        
+        item = cache.pop(content_id, _MISS)
+        if item is not _MISS:
+            # Update existing
+            self.bytes_used += size - item.size
+            item.content = content
+            item.size = size
+            item.last_access_time = current_time
+            cache[content_id] = item
+            return
+        
+        # AdaptSize: large objects are admitted with exponentially lower probability
+        if size > self.capacity_bytes or random.random() > math.exp(-size / self._adapt_c):
+            self.rejections += 1
+            return
+        if cache and admission is not None and (
+                len(cache) >= self.capacity or self.bytes_used + size > self.capacity_bytes):
+            if not admission.admit(content_id, next(iter(cache))):
+                self.rejections += 1
+                return
+        
+        # Evict least recently used items until the newcomer fits
+        victim = None
+        while cache and (len(cache) >= self.capacity or self.bytes_used + size > self.capacity_bytes):
+            victim = cache.pop(next(iter(cache)))
+            self.bytes_used -= victim.size
+            self.evictions += 1
+        if victim is not None:
+            # Reuse the last evicted item's object instead of allocating a new one
+            item = victim.recycle(content_id, content, current_time, size)
+        else:
             item = CacheItem(
                 content_id=content_id,
                 content=content,
                 last_access_time=current_time,
-                insert_time=current_time
+                insert_time=current_time,
+                size=size
             )
-            self.cache[content_id] = item
+        cache[content_id] = item
+        self.bytes_used += size
+    
+    def _tune_adaptsize(self):
+        """Hill-climb the AdaptSize parameter c on the last interval's hit rate"""
+        hits = self.hits - self._adapt_hits
+        misses = self.misses - self._adapt_misses
+        rate = hits / max(1, hits + misses)
+        if rate < self._adapt_last_rate:
+            self._adapt_direction = -self._adapt_direction
+        self._adapt_c = min(max(1.0, self._adapt_c * self.ADAPT_STEP ** self._adapt_direction),
+                            float(self.capacity_bytes))
+        self._adapt_last_rate = rate
+        self._adapt_hits = self.hits
+        self._adapt_misses = self.misses
+        self._next_adapt = self.hits + self.misses + self.ADAPT_INTERVAL
     
     def contains(self, content_id: str) -> bool:
         """Check if content is in cache"""
@@ -80,89 +376,100 @@ class LRUCache:
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
-        return {
-            'strategy': 'LRU',
+        stats = {
+            'strategy': self.strategy,
             'hits': self.hits,
             'misses': self.misses,
-            'hit_rate': hit_rate,
+            'hit_rate': self.hit_rate,
             'evictions': self.evictions,
             'size': len(self.cache),
             'capacity': self.capacity,
-            'utilization': len(self.cache) / self.capacity * 100 if self.capacity > 0 else 0
+            'utilization': self.utilization,
+            'bytes_used': self.bytes_used
         }
+        if self.capacity_bytes is not None:
+            stats['capacity_bytes'] = self.capacity_bytes
+            stats['rejections'] = self.rejections
+            stats['adaptsize_c'] = self._adapt_c
+        return stats
 
-class LFUCache:
+class LFUCache(_CacheBase):
     """Least Frequently Used Cache Implementation"""
+    __slots__ = ('capacity', 'cache', 'frequencies', 'hits', 'misses', 'evictions', 'bytes_used', '_tick', 'admission')
     
-    def __init__(self, capacity: int):
+    strategy = 'LFU'
+    
+    def __init__(self, capacity: int, tinylfu: bool = False):
         self.capacity = capacity
         self.cache: Dict[str, CacheItem] = {}
-        self.frequency_map: Dict[int, OrderedDict[str, CacheItem]] = defaultdict(OrderedDict)
-        self.min_frequency = 0
+        self.frequencies = _FrequencyList()
         self.hits = 0
         self.misses = 0
         self.evictions = 0
+        self.bytes_used = 0
+        self._tick = 0
+        self.admission = CountMinSketch(capacity) if tinylfu else None
     
     def get(self, content_id: str) -> Optional[Any]:
         """Get content from cache"""
-        if content_id not in self.cache:
+        cache = self.cache
+        if self.admission is not None:
+            self.admission.add(content_id)
+        item = cache.get(content_id, _MISS)
+        if item is _MISS:
             self.misses += 1
             return None
         
-        item = self.cache[content_id]
-        old_freq = item.access_count
-        
-        # Update frequency
-        item.access_count += 1
-        item.last_access_time = time.time()
-        
-        # Remove from old frequency bucket
-        if old_freq in self.frequency_map:
-            if content_id in self.frequency_map[old_freq]:
-                del self.frequency_map[old_freq][content_id]
-                if not self.frequency_map[old_freq] and old_freq == self.min_frequency:
-                    self.min_frequency += 1
-        
-        # Add to new frequency bucket
-        new_freq = item.access_count
-        self.frequency_map[new_freq][content_id] = item
+        # Update frequency and move to the next frequency bucket
+        self._tick += 1
+        item.last_access_time = self._tick
+        self.frequencies.touch(item)
         
         self.hits += 1
         return item.content
     
-    def put(self, content_id: str, content: Any):
+    def put(self, content_id: str, content: Any, size: int = 0):
         """Add content to cache"""
-        current_time = time.time()
+        content_id = intern(content_id)
+        cache = self.cache
+        admission = self.admission
+        if admission is not None:
+            admission.add(content_id)
+        self._tick += 1
+        current_time = self._tick
         
-        if content_id in self.cache:
-            # Update existing
-            self.get(content_id)  # This updates frequency
-            self.cache[content_id].content = content
+        item = cache.get(content_id, _MISS)
+        if item is not _MISS:
+            # Update existing: one more access, without get()'s hit and sketch accounting
+            item.last_access_time = current_time
+            self.frequencies.touch(item)
+            item.content = content
+            self.bytes_used += size - item.size
+            item.size = size
         else:
             # Check if cache is full
-            if len(self.cache) >= self.capacity:
-                # Remove least frequently used
-                while self.min_frequency not in self.frequency_map or not self.frequency_map[self.min_frequency]:
-                    self.min_frequency += 1
-                
-                # Remove LRU from min frequency bucket
-                lfu_item_id, _ = self.frequency_map[self.min_frequency].popitem(last=False)
-                del self.cache[lfu_item_id]
+            if len(cache) >= self.capacity:
+                # Remove LRU item from the lowest frequency bucket, unless TinyLFU rejects the newcomer
+                victim = self.frequencies.peek_victim()
+                if admission is not None and not admission.admit(content_id, victim.content_id):
+                    return
+                self.frequencies.remove(victim)
+                del cache[victim.content_id]
+                self.bytes_used -= victim.size
+                # Reuse the evicted item's object instead of allocating a new one
+                item = victim.recycle(content_id, content, current_time, size)
                 self.evictions += 1
-            
-            # Add new content
-            item = CacheItem(
-                content_id=content_id,
-                content=content,
-                access_count=1,
-                last_access_time=current_time,
-                insert_time=current_time
-            )
-            self.cache[content_id] = item
-            self.frequency_map[1][content_id] = item
-            self.min_frequency = 1
+            else:
+                item = CacheItem(
+                    content_id=content_id,
+                    content=content,
+                    last_access_time=current_time,
+                    insert_time=current_time,
+                    size=size
+                )
+            cache[content_id] = item
+            self.bytes_used += size
+            self.frequencies.add(item)
     
     def contains(self, content_id: str) -> bool:
         """Check if content is in cache"""
@@ -170,64 +477,89 @@ class LFUCache:
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
         return {
-            'strategy': 'LFU',
+            'strategy': self.strategy,
             'hits': self.hits,
             'misses': self.misses,
-            'hit_rate': hit_rate,
+            'hit_rate': self.hit_rate,
             'evictions': self.evictions,
             'size': len(self.cache),
             'capacity': self.capacity,
-            'utilization': len(self.cache) / self.capacity * 100 if self.capacity > 0 else 0
+            'utilization': self.utilization,
+            'bytes_used': self.bytes_used
         }
 
-class FIFOCache:
+class FIFOCache(_CacheBase):
     """First In First Out Cache Implementation"""
+    __slots__ = ('capacity', 'cache', 'hits', 'misses', 'evictions', 'bytes_used', '_tick', 'admission')
     
-    def __init__(self, capacity: int):
+    strategy = 'FIFO'
+    
+    def __init__(self, capacity: int, tinylfu: bool = False):
         self.capacity = capacity
-        self.cache: OrderedDict[str, CacheItem] = OrderedDict()
+        self.cache: Dict[str, CacheItem] = {}
         self.hits = 0
         self.misses = 0
         self.evictions = 0
+        self.bytes_used = 0
+        self._tick = 0
+        self.admission = CountMinSketch(capacity) if tinylfu else None
     
     def get(self, content_id: str) -> Optional[Any]:
         """Get content from cache"""
-        if content_id in self.cache:
-            item = self.cache[content_id]
-            item.last_access_time = time.time()
-            item.access_count += 1
-            # Don't move items in FIFO - order is based on insertion
-            self.hits += 1
-            return item.content
-        self.misses += 1
-        return None
+        cache = self.cache
+        if self.admission is not None:
+            self.admission.add(content_id)
+        item = cache.get(content_id, _MISS)
+        if item is _MISS:
+            self.misses += 1
+            return None
+        self._tick += 1
+        item.last_access_time = self._tick
+        item.access_count += 1
+        # Don't move items in FIFO - order is based on insertion
+        self.hits += 1
+        return item.content
     
-    def put(self, content_id: str, content: Any):
+    def put(self, content_id: str, content: Any, size: int = 0):
         """Add content to cache"""
-        current_time = time.time()
+        content_id = intern(content_id)
+        cache = self.cache
+        admission = self.admission
+        if admission is not None:
+            admission.add(content_id)
+        self._tick += 1
+        current_time = self._tick
         
-        if content_id not in self.cache:
+        item = cache.get(content_id, _MISS)
+        if item is _MISS:
             # Check if cache is full
-            if len(self.cache) >= self.capacity:
-                # Remove first item (oldest)
-                self.cache.popitem(last=False)
+            if len(cache) >= self.capacity:
+                # Remove first item (oldest), unless TinyLFU rejects the newcomer
+                victim_id = next(iter(cache))
+                if admission is not None and not admission.admit(content_id, victim_id):
+                    return
+                # Reuse the evicted item's object instead of allocating a new one
+                victim = cache.pop(victim_id)
+                self.bytes_used -= victim.size
+                item = victim.recycle(content_id, content, current_time, size)
                 self.evictions += 1
-            
-            # Add new content at the end
-            item = CacheItem(
-                content_id=content_id,
-                content=content,
-                last_access_time=current_time,
-                insert_time=current_time
-            )
-            self.cache[content_id] = item
+            else:
+                item = CacheItem(
+                    content_id=content_id,
+                    content=content,
+                    last_access_time=current_time,
+                    insert_time=current_time,
+                    size=size
+                )
+            cache[content_id] = item
+            self.bytes_used += size
         else:
             # Update existing content
-            self.cache[content_id].content = content
-            self.cache[content_id].last_access_time = current_time
+            item.content = content
+            self.bytes_used += size - item.size
+            item.size = size
+            item.last_access_time = current_time
     
     def contains(self, content_id: str) -> bool:
         """Check if content is in cache"""
@@ -235,133 +567,229 @@ class FIFOCache:
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        total_requests = self.hits + self.misses
-        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
         return {
-            'strategy': 'FIFO',
+            'strategy': self.strategy,
             'hits': self.hits,
             'misses': self.misses,
-            'hit_rate': hit_rate,
+            'hit_rate': self.hit_rate,
             'evictions': self.evictions,
             'size': len(self.cache),
             'capacity': self.capacity,
-            'utilization': len(self.cache) / self.capacity * 100 if self.capacity > 0 else 0
+            'utilization': self.utilization,
+            'bytes_used': self.bytes_used
         }
 
-class AdaptiveCache:
-    """Adaptive Cache that switches between strategies based on performance"""
+class AdaptiveCache(_CacheBase):
+    """
+    Adaptive Cache that switches between strategies based on performance.
     
-    def __init__(self, capacity: int):
+    All strategies share one store. Recency (LRU), frequency (LFU) and
+    insertion (FIFO) orderings are maintained side by side on every
+    operation, so a strategy switch only changes which ordering picks the
+    next eviction victim - there is no cold cache to re-warm.
+    
+    Strategies are judged on their hit rate over the last
+    PERFORMANCE_WINDOWS evaluation windows, so earlier observations of a
+    strategy are kept after a switch instead of being reset to zero.
+    """
+    __slots__ = (
+        'capacity', 'cache', '_recency', 'frequencies', 'hits', 'misses', 'evictions', 'bytes_used', '_tick',
+        'admission',
+        '_victim_selectors', '_select_victim', '_active_index', 'current_strategy', 'strategy_history',
+        'evaluation_window', 'request_count', '_next_evaluation', '_performance', '_window_log',
+        '_window_slot', '_window_hits', '_window_misses'
+    )
+    
+    STRATEGIES = ('LRU', 'LFU', 'FIFO')
+    PERFORMANCE_WINDOWS = 5
+    
+    def __init__(self, capacity: int, tinylfu: bool = False):
         self.capacity = capacity
-        self.lru_cache = LRUCache(capacity)
-        self.lfu_cache = LFUCache(capacity)
-        self.fifo_cache = FIFOCache(capacity)
+        # Shared store; its insertion order doubles as the FIFO ordering
+        self.cache: Dict[str, CacheItem] = {}
+        self._recency: Dict[str, None] = {}
+        self.frequencies = _FrequencyList()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = 0
+        self._tick = 0
+        self.admission = CountMinSketch(capacity) if tinylfu else None
+        # Indexed like STRATEGIES
+        self._victim_selectors = (self._lru_victim, self._lfu_victim, self._fifo_victim)
         
         # Current strategy
         self.current_strategy = 'LRU'
         self.strategy_history = []
         self.evaluation_window = 100  # Evaluate every 100 requests
         self.request_count = 0
+        self._next_evaluation = self.evaluation_window
         
-        # Strategy performance tracking
-        self.strategy_performance = {
-            'LRU': {'hits': 0, 'misses': 0},
-            'LFU': {'hits': 0, 'misses': 0},
-            'FIFO': {'hits': 0, 'misses': 0}
-        }
+        # Strategy performance tracking: rolling [hits, misses] per strategy,
+        # plus a ring of (strategy index, hits, misses) for each recent window
+        self._performance = np.zeros((len(self.STRATEGIES), 2), dtype=np.int64)
+        self._window_log = np.zeros((self.PERFORMANCE_WINDOWS, 3), dtype=np.int64)
+        self._window_slot = 0
+        self._activate(0)
+    
+    def _activate(self, index: int):
+        """Make the strategy at STRATEGIES[index] choose eviction victims"""
+        self._active_index = index
+        self.current_strategy = self.STRATEGIES[index]
+        self._select_victim = self._victim_selectors[index]
+        # Counter baseline for the current evaluation window
+        self._window_hits = self.hits
+        self._window_misses = self.misses
+    
+    @property
+    def strategy(self) -> str:
+        """Name of the strategy currently choosing eviction victims"""
+        return self.current_strategy
+    
+    def _lru_victim(self) -> str:
+        return next(iter(self._recency))
+    
+    def _lfu_victim(self) -> str:
+        return self.frequencies.peek_victim().content_id
+    
+    def _fifo_victim(self) -> str:
+        return next(iter(self.cache))
+    
+    def _evict(self, victim_id: str) -> CacheItem:
+        """Evict an item from the store and every ordering"""
+        item = self.cache.pop(victim_id)
+        del self._recency[victim_id]
+        self.frequencies.remove(item)
+        self.bytes_used -= item.size
+        self.evictions += 1
+        return item
     
     def get(self, content_id: str) -> Optional[Any]:
-        """Get content from cache using current strategy"""
+        """Get content from cache, updating recency and frequency"""
+        if self.admission is not None:
+            self.admission.add(content_id)
+        item = self.cache.get(content_id, _MISS)
+        if item is _MISS:
+            self.misses += 1
+            result = None
+        else:
+            recency = self._recency
+            del recency[content_id]
+            recency[content_id] = None
+            self._tick += 1
+            item.last_access_time = self._tick
+            self.frequencies.touch(item)
+            self.hits += 1
+            result = item.content
         self.request_count += 1
         
-        if self.current_strategy == 'LRU':
-            result = self.lru_cache.get(content_id)
-            if result:
-                self.strategy_performance['LRU']['hits'] += 1
-            else:
-                self.strategy_performance['LRU']['misses'] += 1
-        elif self.current_strategy == 'LFU':
-            result = self.lfu_cache.get(content_id)
-            if result:
-                self.strategy_performance['LFU']['hits'] += 1
-            else:
-                self.strategy_performance['LFU']['misses'] += 1
-        else:  # FIFO
-            result = self.fifo_cache.get(content_id)
-            if result:
-                self.strategy_performance['FIFO']['hits'] += 1
-            else:
-                self.strategy_performance['FIFO']['misses'] += 1
-        
         # Evaluate and potentially switch strategy
-        if self.request_count % self.evaluation_window == 0:
+        if self.request_count >= self._next_evaluation:
             self._evaluate_and_switch()
         
         return result
     
-    def put(self, content_id: str, content: Any):
-        """Add content to cache using current strategy"""
-        if self.current_strategy == 'LRU':
-            self.lru_cache.put(content_id, content)
-        elif self.current_strategy == 'LFU':
-            self.lfu_cache.put(content_id, content)
-        else:  # FIFO
-            self.fifo_cache.put(content_id, content)
+    def put(self, content_id: str, content: Any, size: int = 0):
+        """Add content to cache, evicting with the current strategy when full"""
+        content_id = intern(content_id)
+        cache = self.cache
+        admission = self.admission
+        if admission is not None:
+            admission.add(content_id)
+        recency = self._recency
+        self._tick += 1
+        current_time = self._tick
+        
+        item = cache.get(content_id, _MISS)
+        if item is not _MISS:
+            # Update existing content
+            item.content = content
+            self.bytes_used += size - item.size
+            item.size = size
+            item.last_access_time = current_time
+            del recency[content_id]
+            recency[content_id] = None
+        else:
+            if len(cache) >= self.capacity:
+                victim_id = self._select_victim()
+                if admission is not None and not admission.admit(content_id, victim_id):
+                    return
+                # Reuse the evicted item's object instead of allocating a new one
+                item = self._evict(victim_id).recycle(content_id, content, current_time, size)
+            else:
+                item = CacheItem(
+                    content_id=content_id,
+                    content=content,
+                    last_access_time=current_time,
+                    insert_time=current_time,
+                    size=size
+                )
+            cache[content_id] = item
+            self.bytes_used += size
+            recency[content_id] = None
+            self.frequencies.add(item)
     
     def contains(self, content_id: str) -> bool:
         """Check if content is in cache"""
-        if self.current_strategy == 'LRU':
-            return self.lru_cache.contains(content_id)
-        elif self.current_strategy == 'LFU':
-            return self.lfu_cache.contains(content_id)
-        else:
-            return self.fifo_cache.contains(content_id)
+        return content_id in self.cache
+    
+    def _fold_window(self):
+        """Record the window that just ended, dropping the oldest one from the rolling totals"""
+        hits = self.hits - self._window_hits
+        misses = self.misses - self._window_misses
+        self._window_hits = self.hits
+        self._window_misses = self.misses
+        
+        slot = self._window_slot
+        expired = self._window_log[slot]
+        self._performance[expired[0]] -= expired[1:]
+        self._window_log[slot] = (self._active_index, hits, misses)
+        self._performance[self._active_index] += (hits, misses)
+        self._window_slot = (slot + 1) % self.PERFORMANCE_WINDOWS
     
     def _evaluate_and_switch(self):
         """Evaluate performance and switch to best strategy"""
-        best_strategy = self.current_strategy
-        best_hit_rate = 0.0
+        self._next_evaluation = self.request_count + self.evaluation_window
+        self._fold_window()
         
-        for strategy in ['LRU', 'LFU', 'FIFO']:
-            perf = self.strategy_performance[strategy]
-            total = perf['hits'] + perf['misses']
-            if total > 0:
-                hit_rate = (perf['hits'] / total) * 100
-                if hit_rate > best_hit_rate:
-                    best_hit_rate = hit_rate
-                    best_strategy = strategy
+        perf = self._performance
+        totals = perf.sum(axis=1)
+        hit_rates = np.divide(perf[:, 0] * 100.0, totals, out=np.zeros(len(totals)), where=totals > 0)
+        best = int(hit_rates.argmax())
         
-        if best_strategy != self.current_strategy:
+        if best != self._active_index and hit_rates[best] > 0:
             self.strategy_history.append({
                 'from': self.current_strategy,
-                'to': best_strategy,
-                'hit_rate': best_hit_rate,
+                'to': self.STRATEGIES[best],
+                'hit_rate': float(hit_rates[best]),
                 'request_count': self.request_count
             })
-            self.current_strategy = best_strategy
-            # Reset performance tracking
-            for strategy in self.strategy_performance:
-                self.strategy_performance[strategy] = {'hits': 0, 'misses': 0}
+            self._activate(best)
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        if self.current_strategy == 'LRU':
-            stats = self.lru_cache.get_stats()
-        elif self.current_strategy == 'LFU':
-            stats = self.lfu_cache.get_stats()
-        else:
-            stats = self.fifo_cache.get_stats()
-        
-        stats['adaptive'] = True
-        stats['current_strategy'] = self.current_strategy
-        stats['strategy_history'] = self.strategy_history[-5:]  # Last 5 switches
-        stats['strategy_performance'] = {
-            k: {
-                'hits': v['hits'],
-                'misses': v['misses'],
-                'hit_rate': (v['hits'] / (v['hits'] + v['misses']) * 100) if (v['hits'] + v['misses']) > 0 else 0
+        # Rolling totals plus the window in progress for the active strategy
+        perf = self._performance.copy()
+        perf[self._active_index] += (self.hits - self._window_hits, self.misses - self._window_misses)
+        return {
+            'strategy': self.strategy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'size': len(self.cache),
+            'capacity': self.capacity,
+            'utilization': self.utilization,
+            'bytes_used': self.bytes_used,
+            'adaptive': True,
+            'current_strategy': self.current_strategy,
+            'strategy_history': self.strategy_history[-5:],  # Last 5 switches
+            'strategy_performance': {
+                k: {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': (hits / (hits + misses) * 100) if (hits + misses) > 0 else 0
+                }
+                for k, (hits, misses) in zip(self.STRATEGIES, perf.tolist())
             }
-            for k, v in self.strategy_performance.items()
         }
-        
-        return stats
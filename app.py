@@ -1,39 +1,107 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import aliased, load_only, make_transient_to_detached
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from werkzeug.security import generate_password_hash, check_password_hash
 import json
-import pandas as pd
+import sqlite3
+import hashlib
 import numpy as np
-from datetime import datetime, timedelta
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
+from datetime import date, datetime, timedelta
 import io
-import base64
-from enhanced_satellite_cdn import Satellite, SimulationConfig, create_content_catalog
+from enhanced_satellite_cdn import Satellite, SimulationConfig, Content, create_content_catalog
 from satellite_constellation import SatelliteConstellation, create_leo_constellation, ConstellationSatellite
+from ntn_network_simulation import NTNSimulation
+from realistic_content_catalog import get_content_by_id
 from advanced_caching import LRUCache, LFUCache, FIFOCache, AdaptiveCache
 from realtime_collaboration import init_collaboration, register_socketio_handlers
 import simpy
 import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import time
 import os
+import random
+import sys
+from collections import Counter
+from itertools import accumulate
+from bisect import bisect
+from functools import lru_cache, partial
+
+try:
+    import orjson
+except ImportError:  # optional: jsonify falls back to Flask's stdlib encoder
+    orjson = None
+
+class IsoDateJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib JSON provider, but dates and datetimes are written as ISO 8601"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+class OrjsonProvider(IsoDateJSONProvider):
+    """JSON provider that serializes jsonify() payloads with orjson.
+
+    Output matches IsoDateJSONProvider: sorted keys, str() of non-string dict
+    keys, and naive datetimes in the same text as datetime.isoformat(), which
+    orjson formats natively. Other non-JSON types go through default().
+    """
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+               | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode()
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app) if orjson is not None else IsoDateJSONProvider(app)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 # Ensure instance folder exists
 instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
 os.makedirs(instance_path, exist_ok=True)
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(instance_path, "orbital_cdn.db")}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Each SQLite connection keeps its own page cache; LIFO checkout keeps reusing the
+# warm ones and lets overflow connections age out. Sized for the threaded server.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_use_lifo': True,
+}
 
-# Initialize SocketIO for real-time collaboration
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+# Initialize SocketIO for real-time collaboration.
+# Real threads: simulations and chart rendering are CPU-bound and would starve a green-thread hub.
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
 db = SQLAlchemy(app)
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+@db.event.listens_for(Engine, 'connect')
+def _configure_sqlite(dbapi_connection, connection_record):
+    """WAL lets the simulation worker write while the web process reads, and with
+    synchronous=NORMAL a commit no longer waits on an fsync (only checkpoints do).
+    Reads go through a memory map of up to SQLITE_MMAP_SIZE instead of read() calls."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        cursor.close()
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -42,6 +110,10 @@ login_manager.login_view = 'login'
 collaboration_manager = init_collaboration(socketio)
 register_socketio_handlers(socketio, collaboration_manager)
 
+# pbkdf2 at 150k rounds: ~50ms per login instead of ~120ms (scrypt default), and the
+# resulting hash fits password_hash's 120 chars (scrypt's does not)
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:150000'
+
 # Database Models
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -53,10 +125,16 @@ class User(UserMixin, db.Model):
     last_login = db.Column(db.DateTime)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD, salt_length=16)
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
+    
+    def needs_rehash(self):
+        return not self.password_hash.startswith(PASSWORD_HASH_METHOD + '$')
+
+# Expression index matching analytics_api's GROUP BY date(created_at)
+db.Index('ix_user_created_date', db.func.date(User.created_at))
 
 class SimulationSession(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -65,6 +143,14 @@ class SimulationSession(db.Model):
     results = db.Column(db.Text)  # JSON string
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='running')  # 'running', 'completed', 'failed'
+    
+    __table_args__ = (
+        db.Index('ix_simulation_session_created_at', 'created_at'),
+        db.Index('ix_simulation_session_user_created', 'user_id', 'created_at'),
+        db.Index('ix_simulation_session_status_created', 'status', 'created_at'),
+    )
+
+db.Index('ix_simulation_session_created_date_status', db.func.date(SimulationSession.created_at), SimulationSession.status)
 
 class ContentRequest(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -78,6 +164,11 @@ class ContentRequest(db.Model):
     delivery_source = db.Column(db.String(50), nullable=False)
     cache_utilization = db.Column(db.Float, nullable=False)
     hit_rate = db.Column(db.Float, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_content_request_timestamp', 'timestamp'),
+        db.Index('ix_content_request_session_timestamp', 'session_id', 'timestamp'),
+    )
 
 class UserMessage(db.Model):
     """User-to-user messaging system"""
@@ -89,6 +180,11 @@ class UserMessage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     read = db.Column(db.Boolean, default=False)
     
+    __table_args__ = (
+        db.Index('ix_user_message_receiver_created', 'receiver_id', 'created_at'),
+        db.Index('ix_user_message_sender_created', 'sender_id', 'created_at'),
+    )
+    
     sender = db.relationship('User', foreign_keys=[sender_id], backref='sent_messages')
     receiver = db.relationship('User', foreign_keys=[receiver_id], backref='received_messages')
 
@@ -103,6 +199,10 @@ class SharedContent(db.Model):
     shared_at = db.Column(db.DateTime, default=datetime.utcnow)
     accessed = db.Column(db.Boolean, default=False)
     
+    __table_args__ = (
+        db.Index('ix_shared_content_receiver_accessed', 'receiver_id', 'accessed', 'shared_at'),
+    )
+    
     sharer = db.relationship('User', foreign_keys=[sharer_id], backref='shared_contents')
     receiver_rel = db.relationship('User', foreign_keys=[receiver_id], backref='received_contents')
 
@@ -131,24 +231,108 @@ def from_json_filter(value):
     except (json.JSONDecodeError, TypeError):
         return {}
 
+# Last admin dashboard render as [key, expiry, html]; the TTL bounds staleness of
+# time-relative fields ("running for N min") and of user edits the key can't see
+DASHBOARD_CACHE_TTL = 5.0
+_dashboard_cache = [None, 0.0, None]
+
+# Last /api/analytics response as [expiry, body]; daily aggregates barely move between polls
+ANALYTICS_CACHE_TTL = 60.0
+_analytics_cache = [0.0, None]
+
+# Detached User snapshots for load_user, which otherwise SELECTs on every authenticated request
+USER_CACHE_TTL = 60.0
+USER_CACHE_SIZE = 1024
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    uid = int(user_id)
+    cached = _user_cache.get(uid)
+    if cached is not None and cached[0] > time.monotonic():
+        # Attach a copy of the snapshot to this request's session without a SELECT
+        return db.session.merge(cached[1], load=False)
+    user = db.session.get(User, uid)
+    if user is not None:
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        with _user_cache_lock:
+            if len(_user_cache) >= USER_CACHE_SIZE:
+                _user_cache.pop(next(iter(_user_cache)))
+            _user_cache[uid] = (time.monotonic() + USER_CACHE_TTL, snapshot)
+    return user
+
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def _evict_cached_user(mapper, connection, target):
+    _user_cache.pop(target.id, None)
+    _dashboard_cache[:] = (None, 0.0, None)
 
 # Global simulation state
 simulation_state = {
-    'running': False,
-    'current_session': None,
-    'satellite': None,
+    'running': False,  # True while any user's simulation is in flight
+    'running_sessions': {},  # { user_id: session_id } of in-flight simulations, one per user
+    'satellite': None,  # Shared on-demand satellite (ensure_runtime_satellite)
+    'satellite_by_user': {},  # { user_id: Satellite } each user's latest finished simulation
     'constellation': None,  # Multi-satellite constellation
     'env': None,
     'config': None,
     'caching_strategy': 'LRU',  # LRU, LFU, FIFO, Adaptive
+    # On-demand NTN simulator, created up front so request handlers never build it
+    'ntn_sim': NTNSimulation(cache_size=12, caching_strategy='LRU'),
     'multi_satellite_enabled': False,
     'collaboration_enabled': False,
     # Track which satellite the current user last connected to (useful for multi-satellite UI)
     'last_connected_satellite_by_user': {}  # { user_id(int): "LEO-1" }
 }
+# Guards check-then-set transitions on simulation_state across request and background threads
+_state_lock = threading.RLock()
+
+# Rows per executemany INSERT when persisting a simulation's request log
+REQUEST_LOG_BATCH_SIZE = 1000
+# Recent request log entries kept in memory while older ones are streamed to the DB
+REQUEST_LOG_WINDOW = 500
+
+# Dashboard charts (rendered SVGs or their series data) keyed by satellite, log lengths and format
+CHART_CACHE_SIZE = 32
+# Most points drawn per time-series chart; longer performance logs are strided
+CHART_MAX_POINTS = 500
+_chart_cache = {}
+_chart_style_ready = False
+
+# Simulations run in worker processes, one per core; each user runs one at a time
+SIMULATION_WORKERS = os.cpu_count() or 1
+_simulation_executor = None
+# Users whose latest finished simulation is kept for /simulation_results
+SIMULATION_RESULTS_USERS = 256
+
+CACHING_STRATEGIES = [
+    {'id': 'LRU', 'name': 'Least Recently Used', 'description': 'Evicts least recently accessed items'},
+    {'id': 'LFU', 'name': 'Least Frequently Used', 'description': 'Evicts least frequently accessed items'},
+    {'id': 'FIFO', 'name': 'First In First Out', 'description': 'Evicts oldest items first'},
+    {'id': 'ADAPTIVE', 'name': 'Adaptive', 'description': 'Automatically switches between strategies based on performance'}
+]
+
+def _user_exists(user_id):
+    """SELECT EXISTS probe for a user id, without loading the row"""
+    return db.session.scalar(db.select(db.exists().where(User.id == user_id)))
+
+def _json_bytes(obj):
+    """Serialize obj the way jsonify() would, for responses built once and reused"""
+    return (app.json.dumps(obj) + '\n').encode()
+
+def _json_bytes_response(body):
+    return app.response_class(body, mimetype=app.json.mimetype)
+
+def _constellation_stats_once(constellation):
+    """Return constellation.get_constellation_stats(), computed at most once per request"""
+    if constellation is None:
+        return None
+    cached = g.get('_constellation_stats')
+    if cached is None or cached[0] is not constellation:
+        cached = g._constellation_stats = (constellation, constellation.get_constellation_stats())
+    return cached[1]
 
 def create_default_admin():
     """Create default admin user if none exists"""
@@ -186,117 +370,232 @@ def ensure_schema_migrations():
         db.create_all()
     except Exception as exc:
         print(f"Schema migration check failed: {exc}")
+        return
+    # create_all skips existing tables, so add indexes introduced since. IF NOT
+    # EXISTS rather than checkfirst: SQLite cannot reflect expression indexes.
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+            except Exception as exc:
+                print(f"Schema migration check failed for index {index.name}: {exc}")
+
+def persist_request_log(session_id, entries):
+    """Queue INSERTs of request log entries for a session (caller commits)"""
+    rows = [{
+        'session_id': session_id,
+        'timestamp': float(entry.get('timestamp', 0.0)),
+        'user_id': str(entry.get('user_id', 'unknown')),
+        'content_id': str(entry.get('content_id', 'unknown')),
+        'content_type': str(entry.get('content_type', 'unknown')),
+        'content_size': int(entry.get('content_size', 0)),
+        'status': str(entry.get('status', 'Miss')),
+        'delivery_source': str(entry.get('delivery_source', 'Unknown')),
+        'cache_utilization': float(entry.get('cache_utilization', 0.0)),
+        'hit_rate': float(entry.get('hit_rate', 0.0))
+    } for entry in entries]
+    for start in range(0, len(rows), REQUEST_LOG_BATCH_SIZE):
+        db.session.execute(
+            db.insert(ContentRequest),
+            rows[start:start + REQUEST_LOG_BATCH_SIZE]
+        )
+
+def simulate_and_persist(config_dict, session_id=None):
+    """Run a simulation to completion and persist its results.
+
+    Runs either in-process or in a simulation worker process; returns the
+    finished Satellite (picklable, see Satellite.__getstate__).
+    """
+    # Create SimPy environment
+    env = simpy.Environment()
+    
+    # Create configuration
+    config = SimulationConfig(
+        simulation_duration=config_dict.get('simulation_duration', 200.0),
+        request_interval=config_dict.get('request_interval', 3.0),
+        cache_size=config_dict.get('cache_size', 12),
+        content_catalog_size=config_dict.get('content_catalog_size', 20),
+        user_count=config_dict.get('user_count', 4),
+        log_interval=config_dict.get('log_interval', 10.0)
+    )
+    
+    # Create content catalog
+    content_catalog = create_content_catalog(config)
+    
+    # Create satellite
+    satellite = Satellite(env, config)
+    
+    # Start user processes, sharing one popularity table for their draws
+    cum_weights = list(accumulate(content.popularity for content in content_catalog))
+    for i in range(config.user_count):
+        user_id = f"User_{i+1}"
+        env.process(user_request_process(env, satellite, content_catalog, user_id, config, cum_weights))
+    
+    # Start performance monitoring
+    env.process(performance_monitor_process(env, satellite, config, session_id))
+    
+    # Run simulation
+    env.run(until=config.simulation_duration)
+    print("Simulation completed successfully")
 
-def run_simulation_background(config_dict):
-    """Run simulation in background thread"""
+    # Persist results and mark session completed
     try:
-        # Create SimPy environment
-        env = simpy.Environment()
-        
-        # Create configuration
-        config = SimulationConfig(
-            simulation_duration=config_dict.get('simulation_duration', 200.0),
-            request_interval=config_dict.get('request_interval', 3.0),
-            cache_size=config_dict.get('cache_size', 12),
-            content_catalog_size=config_dict.get('content_catalog_size', 20),
-            user_count=config_dict.get('user_count', 4),
-            log_interval=config_dict.get('log_interval', 10.0)
-        )
-        
-        # Create content catalog
-        content_catalog = create_content_catalog(config)
-        
-        # Create satellite
-        satellite = Satellite(env, config)
-        
-        # Start user processes
-        for i in range(config.user_count):
-            user_id = f"User_{i+1}"
-            env.process(user_request_process(env, satellite, content_catalog, user_id, config))
-        
-        # Start performance monitoring
-        env.process(performance_monitor_process(env, satellite, config))
-        
-        # Run simulation
-        env.run(until=config.simulation_duration)
-        
-        # Update simulation state
-        simulation_state['running'] = False
-        simulation_state['satellite'] = satellite
-        simulation_state['env'] = env
-        simulation_state['config'] = config
-        
-        print("Simulation completed successfully")
+        with app.app_context():
+            if session_id is not None:
+                sim_session = db.session.get(SimulationSession, session_id)
+                if sim_session:
+                    # Save the entries not already streamed out by the monitor process
+                    persist_request_log(session_id, satellite.request_log)
+                    # Store summarized results
+                    stats = satellite.get_final_statistics()
+                    sim_session.results = json.dumps(stats)
+                    sim_session.status = 'completed'
+                    db.session.commit()
+                    satellite.persisted_session_id = session_id
+    except Exception as persist_exc:
+        print(f"Failed to persist simulation results: {persist_exc}")
+    return satellite
+
+def publish_simulation_results(satellite, user_id):
+    """Make a finished simulation user_id's latest results and end its run"""
+    with _state_lock:
+        results = simulation_state['satellite_by_user']
+        previous = results.pop(user_id, None)
+        if previous is not None:
+            # Charts of the run being replaced will not be asked for again
+            for key in list(_chart_cache):
+                if key[0] is previous:
+                    _chart_cache.pop(key, None)
+        if len(results) >= SIMULATION_RESULTS_USERS:
+            results.pop(next(iter(results)))
+        results[user_id] = satellite
+        release_simulation(user_id)
+
+def release_simulation(user_id):
+    """End user_id's in-flight run; the running flag stays set while others are in flight"""
+    with _state_lock:
+        simulation_state['running_sessions'].pop(user_id, None)
+        simulation_state['running'] = bool(simulation_state['running_sessions'])
+
+def fail_simulation_session(session_id):
+    """Mark a run's SimulationSession failed so it is no longer reported as running"""
+    if session_id is None:
+        return
+    try:
+        with app.app_context():
+            sim_session = db.session.get(SimulationSession, session_id)
+            if sim_session and sim_session.status == 'running':
+                sim_session.status = 'failed'
+                db.session.commit()
+    except Exception as exc:
+        print(f"Failed to mark simulation session {session_id} failed: {exc}")
 
-        # Persist results and mark session completed
-        try:
-            from sqlalchemy import func
-            with app.app_context():
-                session_id = simulation_state.get('current_session')
-                if session_id is not None:
-                    sim_session = SimulationSession.query.get(session_id)
-                    if sim_session:
-                        # Save request logs into ContentRequest
-                        for entry in satellite.request_log:
-                            db.session.add(ContentRequest(
-                                session_id=session_id,
-                                timestamp=float(entry.get('timestamp', 0.0)),
-                                user_id=str(entry.get('user_id', 'unknown')),
-                                content_id=str(entry.get('content_id', 'unknown')),
-                                content_type=str(entry.get('content_type', 'unknown')),
-                                content_size=int(entry.get('content_size', 0)),
-                                status=str(entry.get('status', 'Miss')),
-                                delivery_source=str(entry.get('delivery_source', 'Unknown')),
-                                cache_utilization=float(entry.get('cache_utilization', 0.0)),
-                                hit_rate=float(entry.get('hit_rate', 0.0))
-                            ))
-                        # Store summarized results
-                        stats = satellite.get_final_statistics()
-                        sim_session.results = json.dumps(stats)
-                        sim_session.status = 'completed'
-                        db.session.commit()
-        except Exception as persist_exc:
-            print(f"Failed to persist simulation results: {persist_exc}")
+def user_satellite(user_id):
+    """user_id's latest finished simulation, else the shared on-demand satellite"""
+    return simulation_state['satellite_by_user'].get(user_id) or simulation_state['satellite']
+
+def run_simulation_background(config_dict, user_id, session_id=None):
+    """Run a simulation in the calling thread and publish its results as user_id's"""
+    try:
+        publish_simulation_results(simulate_and_persist(config_dict, session_id), user_id)
+    except Exception as e:
+        print(f"Simulation error: {e}")
+        fail_simulation_session(session_id)
+        release_simulation(user_id)
+
+def _init_simulation_worker():
+    """Drop DB connections inherited from the web process (forked workers)"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def _simulation_pool():
+    """Process pool that runs simulations away from the web server's GIL"""
+    global _simulation_executor
+    with _state_lock:
+        if _simulation_executor is None:
+            _simulation_executor = ProcessPoolExecutor(
+                max_workers=SIMULATION_WORKERS, initializer=_init_simulation_worker
+            )
+        return _simulation_executor
+
+def _discard_simulation_pool(pool):
+    """Forget a broken pool (e.g. a worker was killed) so the next run builds a new one"""
+    global _simulation_executor
+    with _state_lock:
+        if _simulation_executor is pool:
+            _simulation_executor = None
+    pool.shutdown(wait=False)
+
+def _on_simulation_done(user_id, session_id, pool, future):
+    try:
+        publish_simulation_results(future.result(), user_id)
     except Exception as e:
         print(f"Simulation error: {e}")
-        simulation_state['running'] = False
+        if isinstance(e, BrokenProcessPool):
+            _discard_simulation_pool(pool)
+        fail_simulation_session(session_id)
+        release_simulation(user_id)
 
 def ensure_runtime_satellite() -> Satellite:
     """Ensure a runtime satellite and environment exist for on-demand requests."""
     if simulation_state['env'] is None or simulation_state['satellite'] is None:
-        env = simpy.Environment()
-        config = SimulationConfig(
-            simulation_duration=10.0,
-            request_interval=1.0,
-            cache_size=12,
-            content_catalog_size=20,
-            user_count=1,
-            log_interval=5.0
-        )
-        satellite = Satellite(env, config)
-        simulation_state['env'] = env
-        simulation_state['satellite'] = satellite
-        simulation_state['config'] = config
+        with _state_lock:
+            if simulation_state['env'] is None or simulation_state['satellite'] is None:
+                env = simpy.Environment()
+                config = SimulationConfig(
+                    simulation_duration=10.0,
+                    request_interval=1.0,
+                    cache_size=12,
+                    content_catalog_size=20,
+                    user_count=1,
+                    log_interval=5.0
+                )
+                satellite = Satellite(env, config)
+                simulation_state['env'] = env
+                simulation_state['satellite'] = satellite
+                simulation_state['config'] = config
     return simulation_state['satellite']
 
 
-def user_request_process(env, satellite, content_catalog, user_id, config):
-    """User request process for background simulation"""
-    import random
-    content_weights = [content.popularity for content in content_catalog]
+def user_request_process(env, satellite, content_catalog, user_id, config, cum_weights):
+    """User request process for background simulation.
+
+    cum_weights are the running totals of content popularity, in catalog order.
+    """
+    total_weight = cum_weights[-1] + 0.0
+    last_index = len(cum_weights) - 1
+    draw = random.random
+    request_content = satellite.request_content
+    timeout = env.timeout
+    duration = config.simulation_duration
+    interval = config.request_interval
     
-    while env.now < config.simulation_duration:
+    while env.now < duration:
         try:
-            selected_content = random.choices(content_catalog, weights=content_weights)[0]
-            log_entry = satellite.request_content(selected_content.content_id, selected_content, user_id)
-            yield env.timeout(config.request_interval)
+            selected_content = content_catalog[bisect(cum_weights, draw() * total_weight, 0, last_index)]
+            request_content(selected_content.content_id, selected_content, user_id)
+            yield timeout(interval)
         except simpy.Interrupt:
             break
 
-def performance_monitor_process(env, satellite, config):
-    """Performance monitoring process for background simulation"""
+def performance_monitor_process(env, satellite, config, session_id=None):
+    """Performance monitoring process for background simulation.
+
+    With a session, request log entries older than REQUEST_LOG_WINDOW are
+    written to the database and dropped so the log does not grow with the run.
+    """
     while env.now < config.simulation_duration:
         satellite.log_performance()
+        overflow = len(satellite.request_log) - REQUEST_LOG_WINDOW
+        if session_id is not None and overflow >= REQUEST_LOG_WINDOW:
+            try:
+                with app.app_context():
+                    persist_request_log(session_id, satellite.request_log[:overflow])
+                    db.session.commit()
+                del satellite.request_log[:overflow]
+            except Exception as flush_exc:
+                print(f"Failed to stream request log: {flush_exc}")
         yield env.timeout(config.log_interval)
 
 # Routes
@@ -313,6 +612,8 @@ def login():
         
         if user and user.check_password(password):
             login_user(user)
+            if user.needs_rehash():
+                user.set_password(password)
             user.last_login = datetime.utcnow()
             db.session.commit()
             flash('Login successful!', 'success')
@@ -376,21 +677,55 @@ def admin_dashboard():
         flash('Access denied. Admin privileges required.', 'error')
         return redirect(url_for('user_dashboard'))
     
+    # Reuse the last render while none of the rows or runtime state it shows has moved
+    current_satellite = user_satellite(current_user.id)
+    cache_key = (
+        current_user.id,
+        current_user.last_login,
+        current_satellite,
+        getattr(current_satellite, 'total_requests', None),
+        *db.session.execute(db.select(
+            db.select(db.func.max(User.id)).scalar_subquery(),
+            db.select(db.func.max(SimulationSession.id)).scalar_subquery(),
+            db.select(db.func.count(SimulationSession.id))
+                .where(SimulationSession.status == 'running').scalar_subquery(),
+            db.select(db.func.max(ContentRequest.id)).scalar_subquery()
+        )).one()
+    )
+    cached_key, expires, html = _dashboard_cache
+    if cached_key == cache_key and time.monotonic() < expires:
+        return html
+    
     # Get all simulation sessions
     sessions = SimulationSession.query.order_by(SimulationSession.created_at.desc()).limit(20).all()
     
-    # Get user statistics
-    total_users = User.query.count()
-    total_sessions = SimulationSession.query.count()
-    completed_sessions = SimulationSession.query.filter_by(status='completed').count()
-    running_sessions = SimulationSession.query.filter_by(status='running').count()
+    # Get session statistics with one grouped count
+    sessions_by_status = dict(
+        db.session.query(SimulationSession.status, db.func.count(SimulationSession.id))
+        .group_by(SimulationSession.status)
+        .all()
+    )
+    total_sessions = sum(sessions_by_status.values())
+    completed_sessions = sessions_by_status.get('completed', 0)
+    running_sessions = sessions_by_status.get('running', 0)
     
-    # Get recent content requests
-    recent_requests = ContentRequest.query.order_by(ContentRequest.timestamp.desc()).limit(50).all()
+    # Get recent content requests (only the columns the dashboard shows)
+    recent_requests = (
+        ContentRequest.query
+        .options(load_only(
+            ContentRequest.id, ContentRequest.session_id, ContentRequest.user_id,
+            ContentRequest.content_id, ContentRequest.content_type,
+            ContentRequest.status, ContentRequest.timestamp
+        ))
+        .order_by(ContentRequest.timestamp.desc())
+        .limit(50)
+        .all()
+    )
 
     # Users list for management table and lookups
     users = User.query.order_by(User.created_at.desc()).all()
     user_map = {u.id: u.username for u in users}
+    total_users = len(users)
 
     # Active simulations and pending users (no workflow -> empty list)
     active_simulations = SimulationSession.query.filter_by(status='running').all()
@@ -416,22 +751,25 @@ def admin_dashboard():
 
     now = datetime.utcnow()
 
-    # Current satellite runtime KPIs if available
-    current_satellite = simulation_state.get('satellite')
+    # Current satellite runtime KPIs if available. The newest request log entry
+    # holds the counters as one consistent snapshot, whereas reading the live
+    # attributes can interleave with an on-demand request updating them.
     current_kpis = None
     if current_satellite is not None:
         try:
+            request_log = current_satellite.request_log
+            latest = request_log[-1] if request_log else {}
             current_kpis = {
-                'cache_utilization': len(current_satellite.cache) / current_satellite.cache_size if current_satellite.cache_size else 0.0,
-                'hit_rate': (current_satellite.cache_hits / current_satellite.total_requests) * 100 if current_satellite.total_requests else 0.0,
-                'cache_size': len(current_satellite.cache),
+                'cache_utilization': latest.get('cache_utilization', 0.0),
+                'hit_rate': latest.get('hit_rate', 0.0),
+                'cache_size': latest.get('cache_size', 0),
                 'cache_capacity': current_satellite.cache_size,
                 'satellite_name': 'LEO-1'
             }
         except Exception:
             current_kpis = None
     
-    return render_template('admin_dashboard.html', 
+    html = render_template('admin_dashboard.html', 
                          sessions=sessions, 
                          users=users,
                          user_map=user_map,
@@ -445,11 +783,14 @@ def admin_dashboard():
                          cdn_stats=cdn_stats,
                          current_kpis=current_kpis,
                          now=now)
+    _dashboard_cache[:] = (cache_key, time.monotonic() + DASHBOARD_CACHE_TTL, html)
+    return html
 
 @app.route('/start_simulation', methods=['POST'])
 @login_required
 def start_simulation():
-    if simulation_state['running']:
+    user_id = current_user.id
+    if user_id in simulation_state['running_sessions']:
         return jsonify({'error': 'Simulation already running'})
     
     config_data = {
@@ -461,133 +802,214 @@ def start_simulation():
         'log_interval': float(request.form.get('log_interval', 10))
     }
     
+    # Claim the user's run before the DB write so two concurrent starts cannot both pass the check
+    with _state_lock:
+        if user_id in simulation_state['running_sessions']:
+            return jsonify({'error': 'Simulation already running'})
+        simulation_state['running_sessions'][user_id] = None
+        simulation_state['running'] = True
+    
     # Create simulation session
-    session = SimulationSession(
-        user_id=current_user.id,
-        config=json.dumps(config_data),
-        status='running'
-    )
-    db.session.add(session)
-    db.session.commit()
+    try:
+        session = SimulationSession(
+            user_id=user_id,
+            config=json.dumps(config_data),
+            status='running'
+        )
+        db.session.add(session)
+        db.session.commit()
+    except Exception:
+        release_simulation(user_id)
+        raise
     
-    # Start simulation in background
-    simulation_state['running'] = True
-    simulation_state['current_session'] = session.id
+    # Start simulation in a worker process
+    simulation_state['running_sessions'][user_id] = session.id
     
-    thread = threading.Thread(target=run_simulation_background, args=(config_data,))
-    thread.daemon = True
-    thread.start()
+    pool = _simulation_pool()
+    try:
+        future = pool.submit(simulate_and_persist, config_data, session.id)
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            _discard_simulation_pool(pool)
+        fail_simulation_session(session.id)
+        release_simulation(user_id)
+        raise
+    future.add_done_callback(partial(_on_simulation_done, user_id, session.id, pool))
     
     return jsonify({'success': True, 'session_id': session.id})
 
 @app.route('/simulation_status')
 @login_required
 def simulation_status():
-    if simulation_state['running']:
-        return jsonify({'status': 'running'})
-    else:
-        return jsonify({'status': 'completed'})
+    running = current_user.id in simulation_state['running_sessions']
+    response = jsonify({'status': 'running' if running else 'completed'})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/simulation_results')
 @login_required
 def simulation_results():
-    if not simulation_state['satellite']:
+    satellite = simulation_state['satellite_by_user'].get(current_user.id)
+    if not satellite:
         return jsonify({'error': 'No simulation results available'})
     
-    satellite = simulation_state['satellite']
     stats = satellite.get_final_statistics()
     
-    # Convert logs to DataFrames for analysis
-    request_df = pd.DataFrame(satellite.request_log)
-    performance_df = pd.DataFrame(satellite.performance_log)
+    persisted_session_id = getattr(satellite, 'persisted_session_id', None)
     
-    # Generate charts
-    charts = generate_charts(request_df, performance_df, stats)
+    # Logs are append-only, so their lengths identify the data a chart set was drawn from.
+    # ?charts=data returns the plotted series for client-side charts and skips matplotlib.
+    chart_format = 'data' if request.args.get('charts') == 'data' else 'svg'
+    fingerprint = (satellite, persisted_session_id, len(satellite.request_log), len(satellite.performance_log), chart_format)
+    charts = _chart_cache.get(fingerprint)
+    if charts is None:
+        content_type_counts, status_counts = request_counts(satellite.request_log, persisted_session_id)
+        if chart_format == 'data':
+            charts = chart_series(content_type_counts, status_counts, satellite.performance_log)
+        else:
+            charts = generate_charts(content_type_counts, status_counts, satellite.performance_log, stats)
+        if len(_chart_cache) >= CHART_CACHE_SIZE:
+            _chart_cache.pop(next(iter(_chart_cache)))
+        _chart_cache[fingerprint] = charts
     
     return jsonify({
         'statistics': stats,
         'charts': charts,
-        'request_count': len(satellite.request_log),
+        'chart_format': chart_format,
+        'request_count': stats.get('total_requests', len(satellite.request_log)),
         'performance_count': len(satellite.performance_log)
     })
 
-def generate_charts(request_df, performance_df, stats):
-    """Generate base64 encoded charts for dashboard display"""
-    charts = {}
-    
-    # Set style - use available style
-    try:
-        plt.style.use('seaborn-v0_8')
-    except OSError:
+def _chart_points(performance_log):
+    """Every nth performance log entry, so at most CHART_MAX_POINTS are plotted"""
+    step = max(1, -(-len(performance_log) // CHART_MAX_POINTS))
+    return performance_log[::step]
+
+def chart_series(content_type_counts, status_counts, performance_log):
+    """The data behind generate_charts' four charts, for rendering in the browser"""
+    performance_log = _chart_points(performance_log)
+    return {
+        'timestamps': [entry['timestamp'] for entry in performance_log],
+        'hit_rate': [entry['hit_rate'] for entry in performance_log],
+        'cache_utilization': [entry['cache_utilization'] for entry in performance_log],
+        'content_distribution': dict(content_type_counts.most_common()),
+        'request_status': dict(status_counts.most_common())
+    }
+
+def _load_matplotlib():
+    """Import matplotlib on first chart render and apply the dashboard style once.
+
+    Plotting libraries are only needed for /simulation_results, so they are kept
+    out of app start-up.
+    """
+    global _chart_style_ready
+    import matplotlib
+    import matplotlib.style
+    if not _chart_style_ready:
+        matplotlib.use('Agg')
+        # Set style - use available style
         try:
-            plt.style.use('seaborn')
+            matplotlib.style.use('seaborn-v0_8')
         except OSError:
-            plt.style.use('default')
-            sns.set_style("whitegrid")
+            try:
+                matplotlib.style.use('seaborn')
+            except OSError:
+                import seaborn as sns
+                matplotlib.style.use('default')
+                sns.set_style("whitegrid")
+        _chart_style_ready = True
+    return matplotlib
+
+def _figure_to_svg(fig):
+    """Render a Figure to SVG markup (text kept as <text>, not glyph paths)"""
+    matplotlib = _load_matplotlib()
+    img = io.StringIO()
+    with matplotlib.rc_context({'svg.fonttype': 'none'}):
+        fig.savefig(img, format='svg', bbox_inches='tight')
+    return img.getvalue()
+
+def request_counts(request_log, session_id=None):
+    """Count requests by content type and by status.
+
+    Once a run's log has been persisted (session_id given) the counts come from
+    the database, since older entries are no longer held in memory.
+    """
+    content_type_counts = Counter()
+    status_counts = Counter()
+    if session_id is None:
+        # Single pass over the log for both tallies
+        for entry in request_log:
+            content_type_counts[entry['content_type']] += 1
+            status_counts[entry['status']] += 1
+        return content_type_counts, status_counts
+    
+    rows = (
+        db.session.query(ContentRequest.content_type, ContentRequest.status, db.func.count(ContentRequest.id))
+        .filter(ContentRequest.session_id == session_id)
+        .group_by(ContentRequest.content_type, ContentRequest.status)
+    )
+    for content_type, status, count in rows:
+        content_type_counts[content_type] += count
+        status_counts[status] += count
+    return content_type_counts, status_counts
+
+def generate_charts(content_type_counts, status_counts, performance_log, stats):
+    """Generate SVG charts for dashboard display"""
+    _load_matplotlib()
+    from matplotlib.figure import Figure
+    charts = {}
+    
+    # Split the performance log into its plotted series in one pass
+    timestamps = []
+    hit_rates = []
+    utilizations = []
+    for entry in _chart_points(performance_log):
+        timestamps.append(entry['timestamp'])
+        hit_rates.append(entry['hit_rate'])
+        utilizations.append(entry['cache_utilization'])
     
     # 1. Cache Hit Rate Over Time
-    if not performance_df.empty:
-        plt.figure(figsize=(10, 6))
-        plt.plot(performance_df['timestamp'], performance_df['hit_rate'], marker='o', linewidth=2)
-        plt.title('Cache Hit Rate Over Time', fontsize=14, fontweight='bold')
-        plt.xlabel('Simulation Time', fontsize=12)
-        plt.ylabel('Hit Rate (%)', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        # Save to base64
-        img = io.BytesIO()
-        plt.savefig(img, format='png', dpi=300, bbox_inches='tight')
-        img.seek(0)
-        charts['hit_rate'] = base64.b64encode(img.getvalue()).decode()
-        plt.close()
+    if performance_log:
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot(111)
+        ax.plot(timestamps, hit_rates, marker='o', linewidth=2)
+        ax.set_title('Cache Hit Rate Over Time', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Simulation Time', fontsize=12)
+        ax.set_ylabel('Hit Rate (%)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        charts['hit_rate'] = _figure_to_svg(fig)
     
     # 2. Cache Utilization Over Time
-    if not performance_df.empty:
-        plt.figure(figsize=(10, 6))
-        plt.plot(performance_df['timestamp'], performance_df['cache_utilization'], marker='s', linewidth=2, color='orange')
-        plt.title('Cache Utilization Over Time', fontsize=14, fontweight='bold')
-        plt.xlabel('Simulation Time', fontsize=12)
-        plt.ylabel('Cache Utilization', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        img = io.BytesIO()
-        plt.savefig(img, format='png', dpi=300, bbox_inches='tight')
-        img.seek(0)
-        charts['cache_utilization'] = base64.b64encode(img.getvalue()).decode()
-        plt.close()
+    if performance_log:
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot(111)
+        ax.plot(timestamps, utilizations, marker='s', linewidth=2, color='orange')
+        ax.set_title('Cache Utilization Over Time', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Simulation Time', fontsize=12)
+        ax.set_ylabel('Cache Utilization', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        charts['cache_utilization'] = _figure_to_svg(fig)
     
     # 3. Content Type Distribution
-    if not request_df.empty:
-        plt.figure(figsize=(10, 6))
-        content_type_counts = request_df['content_type'].value_counts()
-        plt.pie(content_type_counts.values, labels=content_type_counts.index, autopct='%1.1f%%', startangle=90)
-        plt.title('Content Type Distribution', fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        
-        img = io.BytesIO()
-        plt.savefig(img, format='png', dpi=300, bbox_inches='tight')
-        img.seek(0)
-        charts['content_distribution'] = base64.b64encode(img.getvalue()).decode()
-        plt.close()
+    if content_type_counts:
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot(111)
+        content_types, type_counts = zip(*content_type_counts.most_common())
+        ax.pie(type_counts, labels=content_types, autopct='%1.1f%%', startangle=90)
+        ax.set_title('Content Type Distribution', fontsize=14, fontweight='bold')
+        charts['content_distribution'] = _figure_to_svg(fig)
     
     # 4. Request Status Comparison
-    if not request_df.empty:
-        plt.figure(figsize=(8, 6))
-        status_counts = request_df['status'].value_counts()
-        colors = ['#2ecc71' if status == 'Hit' else '#e74c3c' for status in status_counts.index]
-        plt.bar(status_counts.index, status_counts.values, color=colors, alpha=0.8)
-        plt.title('Request Status Comparison', fontsize=14, fontweight='bold')
-        plt.xlabel('Status', fontsize=12)
-        plt.ylabel('Count', fontsize=12)
-        plt.tight_layout()
-        
-        img = io.BytesIO()
-        plt.savefig(img, format='png', dpi=300, bbox_inches='tight')
-        img.seek(0)
-        charts['request_status'] = base64.b64encode(img.getvalue()).decode()
-        plt.close()
+    if status_counts:
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot(111)
+        statuses, counts = zip(*status_counts.most_common())
+        colors = ['#2ecc71' if status == 'Hit' else '#e74c3c' for status in statuses]
+        ax.bar(statuses, counts, color=colors, alpha=0.8)
+        ax.set_title('Request Status Comparison', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Status', fontsize=12)
+        ax.set_ylabel('Count', fontsize=12)
+        charts['request_status'] = _figure_to_svg(fig)
     
     return charts
 
@@ -597,41 +1019,60 @@ def analytics_api():
     if current_user.role != 'admin':
         return jsonify({'error': 'Admin access required'}), 403
     
-    # Get analytics data
-    total_users = User.query.count()
-    total_sessions = SimulationSession.query.count()
-    completed_sessions = SimulationSession.query.filter_by(status='completed').count()
+    expires, body = _analytics_cache
+    if body is not None and expires > time.monotonic():
+        return _json_bytes_response(body)
     
-    # User growth over time
-    users_over_time = db.session.query(
+    # One round trip: per-day user counts and per-day/per-status session counts,
+    # from which the totals are summed
+    user_days = db.select(
+        db.literal('user').label('kind'),
         db.func.date(User.created_at).label('date'),
+        db.literal(None).label('status'),
         db.func.count(User.id).label('count')
-    ).group_by(db.func.date(User.created_at)).all()
-    
-    # Session statistics by day
-    sessions_over_time = db.session.query(
+    ).group_by(db.func.date(User.created_at))
+    session_days = db.select(
+        db.literal('session').label('kind'),
         db.func.date(SimulationSession.created_at).label('date'),
+        SimulationSession.status.label('status'),
         db.func.count(SimulationSession.id).label('count')
-    ).group_by(db.func.date(SimulationSession.created_at)).all()
+    ).group_by(db.func.date(SimulationSession.created_at), SimulationSession.status)
+    rows = db.session.execute(db.union_all(user_days, session_days).order_by('kind', 'date')).all()
     
-    return jsonify({
-        'total_users': total_users,
-        'total_sessions': total_sessions,
+    users_over_time = {}
+    sessions_over_time = {}
+    completed_sessions = 0
+    for kind, day, status, count in rows:
+        if kind == 'user':
+            users_over_time[day] = users_over_time.get(day, 0) + count
+        else:
+            sessions_over_time[day] = sessions_over_time.get(day, 0) + count
+            if status == 'completed':
+                completed_sessions += count
+    
+    body = _json_bytes({
+        'total_users': sum(users_over_time.values()),
+        'total_sessions': sum(sessions_over_time.values()),
         'completed_sessions': completed_sessions,
-        'users_over_time': [{'date': str(u.date), 'count': u.count} for u in users_over_time],
-        'sessions_over_time': [{'date': str(s.date), 'count': s.count} for s in sessions_over_time]
+        'users_over_time': [{'date': str(day), 'count': count} for day, count in users_over_time.items()],
+        'sessions_over_time': [{'date': str(day), 'count': count} for day, count in sessions_over_time.items()]
     })
+    _analytics_cache[:] = (time.monotonic() + ANALYTICS_CACHE_TTL, body)
+    return _json_bytes_response(body)
 
 @app.route('/api/admin/monitoring')
 @login_required
 def admin_monitoring_api():
     if current_user.role != 'admin':
         return jsonify({'error': 'Admin access required'}), 403
-    active_sessions = SimulationSession.query.filter_by(status='running').count()
-    return jsonify({
-        'active_sessions': active_sessions,
+    # In-flight runs are tracked as they start and finish, so no COUNT over
+    # session rows is needed for this poll
+    response = jsonify({
+        'active_sessions': len(simulation_state['running_sessions']),
         'timestamp': datetime.utcnow().isoformat() + 'Z'
     })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/api/request_content', methods=['POST'])
 @login_required
@@ -639,7 +1080,8 @@ def api_request_content():
     """Handle realistic NTN content request with proper algorithmic flow."""
     try:
         payload = request.get_json(silent=True) or {}
-        content_id = payload.get('content_id', '').strip()
+        # Interned so it matches the catalog/cache keys by identity
+        content_id = sys.intern(payload.get('content_id', '').strip())
         
         if not content_id:
             return jsonify({
@@ -648,21 +1090,12 @@ def api_request_content():
                 'content_delivered': False
             }), 400
         
-        # Initialize NTN simulation if not exists (respect selected caching strategy)
+        # If user changed strategy, refresh the simulator so the cache policy matches
         selected_strategy = simulation_state.get('caching_strategy', 'LRU')
-        if 'ntn_sim' not in simulation_state:
-            from ntn_network_simulation import NTNSimulation
-            simulation_state['ntn_sim'] = NTNSimulation(cache_size=12, caching_strategy=selected_strategy)
-        else:
-            # If user changed strategy, refresh the simulator so the cache policy matches
-            try:
-                if getattr(simulation_state['ntn_sim'], 'caching_strategy', None) != str(selected_strategy).upper():
-                    from ntn_network_simulation import NTNSimulation
-                    simulation_state['ntn_sim'] = NTNSimulation(cache_size=12, caching_strategy=selected_strategy)
-            except Exception:
-                pass
-        
-        ntn_sim = simulation_state['ntn_sim']
+        with _state_lock:
+            if simulation_state['ntn_sim'].caching_strategy != str(selected_strategy).upper():
+                simulation_state['ntn_sim'] = NTNSimulation(cache_size=12, caching_strategy=selected_strategy)
+            ntn_sim = simulation_state['ntn_sim']
         
         # Simulate realistic content request
         result = ntn_sim.simulate_request(content_id, str(current_user.id))
@@ -690,8 +1123,9 @@ def api_request_content():
         stats = ntn_sim.get_statistics()
         
         # Persist to database
-        session_id = simulation_state.get('current_session')
-        db.session.add(ContentRequest(
+        # Attributed to the user's own in-flight run, if any
+        session_id = simulation_state['running_sessions'].get(current_user.id)
+        db.session.execute(db.insert(ContentRequest).values(
             session_id=session_id or 0,
             timestamp=float(result.get('timestamp', 0.0)),
             user_id=str(current_user.id),
@@ -731,7 +1165,7 @@ def api_request_content():
                 'size_mb': content.size_mb,
                 'description': content.description,
                 'category': content.category,
-                'received_at': datetime.utcnow().isoformat()
+                'received_at': datetime.utcnow()
             },
             'steps': result.get('steps', []),
             'statistics': stats
@@ -769,44 +1203,26 @@ def api_request_content():
 def available_content():
     """Get list of available content from catalog with filtering"""
     try:
-        if 'ntn_sim' not in simulation_state:
-            from ntn_network_simulation import NTNSimulation
-            simulation_state['ntn_sim'] = NTNSimulation(cache_size=12, caching_strategy=simulation_state.get('caching_strategy', 'LRU'))
-        
-        ntn_sim = simulation_state['ntn_sim']
-        content_list = ntn_sim.get_available_content()
-        
-        # Apply filters if provided
-        content_type = request.args.get('type', '')
-        size_filter = request.args.get('size', '')
-        
-        filtered_content = content_list
-        
-        if content_type:
-            filtered_content = [c for c in filtered_content if c['type'] == content_type]
-        
-        if size_filter:
-            if size_filter == '0-10':
-                filtered_content = [c for c in filtered_content if 0 <= c['size_mb'] < 10]
-            elif size_filter == '10-50':
-                filtered_content = [c for c in filtered_content if 10 <= c['size_mb'] < 50]
-            elif size_filter == '50-100':
-                filtered_content = [c for c in filtered_content if 50 <= c['size_mb'] < 100]
-            elif size_filter == '100+':
-                filtered_content = [c for c in filtered_content if c['size_mb'] >= 100]
-        
-        return jsonify({
-            'success': True,
-            'content': filtered_content,
-            'total_items': len(filtered_content),
-            'filters_applied': {
-                'type': content_type,
-                'size': size_filter
-            }
-        })
+        return _json_bytes_response(_available_content_body(request.args.get('type', ''), request.args.get('size', '')))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# Every NTNSimulation serves the static REALISTIC_CONTENT_CATALOG, so one serialized
+# response per (type, size) filter pair stays valid for the life of the process
+@lru_cache(maxsize=64)
+def _available_content_body(content_type, size_filter):
+    filtered_content = simulation_state['ntn_sim'].get_available_content(content_type, size_filter)
+    
+    return _json_bytes({
+        'success': True,
+        'content': filtered_content,
+        'total_items': len(filtered_content),
+        'filters_applied': {
+            'type': content_type,
+            'size': size_filter
+        }
+    })
+
 # =============================================================================
 # USER INTERACTION APIs - Messaging & Content Sharing
 # =============================================================================
@@ -824,8 +1240,7 @@ def send_message():
         if not receiver_id or not message:
             return jsonify({'error': 'Receiver ID and message are required'}), 400
         
-        receiver = User.query.get(receiver_id)
-        if not receiver:
+        if not _user_exists(receiver_id):
             return jsonify({'error': 'Receiver not found'}), 404
         
         user_message = UserMessage(
@@ -840,7 +1255,7 @@ def send_message():
         return jsonify({
             'success': True,
             'message_id': user_message.id,
-            'created_at': user_message.created_at.isoformat()
+            'created_at': user_message.created_at
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -850,24 +1265,32 @@ def send_message():
 def get_messages():
     """Get user's messages"""
     try:
-        messages = UserMessage.query.filter(
-            (UserMessage.receiver_id == current_user.id) | 
-            (UserMessage.sender_id == current_user.id)
-        ).order_by(UserMessage.created_at.desc()).limit(50).all()
-        
+        # Newest 50 per direction, each an index range scan that stops early,
+        # instead of sorting every message matching the OR
+        def newest(column):
+            return db.select(UserMessage.id).where(column == current_user.id) \
+                .order_by(UserMessage.created_at.desc()).limit(50).subquery()
+        
+        candidate_ids = db.union_all(
+            db.select(newest(UserMessage.receiver_id)), db.select(newest(UserMessage.sender_id))
+        ).subquery()
+        # Plain rows of just the serialized columns; no ORM objects to hydrate per message
+        sender, receiver = aliased(User), aliased(User)
+        rows = db.session.execute(
+            db.select(
+                UserMessage.id, UserMessage.sender_id, sender.username.label('sender_username'),
+                UserMessage.receiver_id, receiver.username.label('receiver_username'),
+                UserMessage.message, UserMessage.content_id, UserMessage.created_at, UserMessage.read
+            )
+            .outerjoin(sender, sender.id == UserMessage.sender_id)
+            .outerjoin(receiver, receiver.id == UserMessage.receiver_id)
+            .where(UserMessage.id.in_(db.select(candidate_ids.c.id)))
+            .order_by(UserMessage.created_at.desc()).limit(50)
+        ).all()
+        
+        user_id = current_user.id
         return jsonify({
-            'messages': [{
-                'id': msg.id,
-                'sender_id': msg.sender_id,
-                'sender_username': msg.sender.username,
-                'receiver_id': msg.receiver_id,
-                'receiver_username': msg.receiver.username,
-                'message': msg.message,
-                'content_id': msg.content_id,
-                'created_at': msg.created_at.isoformat(),
-                'read': msg.read,
-                'is_sent': msg.sender_id == current_user.id
-            } for msg in messages]
+            'messages': [dict(row._asdict(), is_sent=row.sender_id == user_id) for row in rows]
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -886,8 +1309,7 @@ def share_content():
         if not receiver_id or not content_id:
             return jsonify({'error': 'Receiver ID and content ID are required'}), 400
         
-        receiver = User.query.get(receiver_id)
-        if not receiver:
+        if not _user_exists(receiver_id):
             return jsonify({'error': 'Receiver not found'}), 404
         
         shared = SharedContent(
@@ -912,37 +1334,45 @@ def share_content():
 def get_shared_content():
     """Get content shared with current user"""
     try:
-        shared = SharedContent.query.filter_by(
-            receiver_id=current_user.id,
-            accessed=False
-        ).order_by(SharedContent.shared_at.desc()).all()
+        rows = db.session.execute(
+            db.select(
+                SharedContent.id, User.username.label('sharer_username'), SharedContent.content_id,
+                SharedContent.content_type, SharedContent.content_size, SharedContent.shared_at
+            )
+            .outerjoin(User, User.id == SharedContent.sharer_id)
+            .where(SharedContent.receiver_id == current_user.id, SharedContent.accessed == False)
+            .order_by(SharedContent.shared_at.desc())
+        ).all()
         
         return jsonify({
-            'shared_content': [{
-                'id': s.id,
-                'sharer_username': s.sharer.username,
-                'content_id': s.content_id,
-                'content_type': s.content_type,
-                'content_size': s.content_size,
-                'shared_at': s.shared_at.isoformat()
-            } for s in shared]
+            'shared_content': [row._asdict() for row in rows]
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+USERS_PAGE_SIZE = 100
+USERS_PAGE_SIZE_MAX = 500
+
 @app.route('/api/get_users', methods=['GET'])
 @login_required
 def get_users():
-    """Get list of users for messaging/sharing"""
+    """Get a page of users for messaging/sharing (?page=1&per_page=100)"""
     try:
-        users = User.query.filter(User.id != current_user.id).all()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', USERS_PAGE_SIZE, type=int), 1), USERS_PAGE_SIZE_MAX)
+        # Project just the listed columns; fetch one extra row to know if another page exists
+        rows = db.session.execute(
+            db.select(User.id, User.username, User.email, User.role)
+            .where(User.id != current_user.id)
+            .order_by(User.id)
+            .limit(per_page + 1)
+            .offset((page - 1) * per_page)
+        ).all()
         return jsonify({
-            'users': [{
-                'id': u.id,
-                'username': u.username,
-                'email': u.email,
-                'role': u.role
-            } for u in users]
+            'users': [row._asdict() for row in rows[:per_page]],
+            'page': page,
+            'per_page': per_page,
+            'has_more': len(rows) > per_page
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -952,12 +1382,37 @@ def get_users():
 def satellite_status():
     """Get real-time satellite constellation status with connection info"""
     try:
-        satellites = SatelliteNode.query.filter_by(status='active').all()
-        satellite = simulation_state.get('satellite')
+        satellite = user_satellite(current_user.id)
+        constellation = simulation_state.get('constellation')
         
-        satellite_data = []
-        if satellite:
-            satellite_data.append({
+        connected_satellite_id = None
+        try:
+            connected_satellite_id = simulation_state.get('last_connected_satellite_by_user', {}).get(int(current_user.id))
+        except Exception:
+            connected_satellite_id = None
+        
+        # Every served request bumps a total_requests counter, so this token moves
+        # whenever anything in the payload can have changed
+        etag = hashlib.blake2b(repr((
+            id(satellite),
+            (satellite.total_requests, satellite.cache_hits, len(satellite.cache)) if satellite else None,
+            id(constellation),
+            (len(constellation.satellites), sum(s.total_requests for s in constellation.satellites)) if constellation else None,
+            connected_satellite_id,
+            bool(simulation_state.get('multi_satellite_enabled')),
+            simulation_state.get('caching_strategy', 'LRU')
+        )).encode(), digest_size=8).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        # Constellation data, when available, replaces the single-satellite entry
+        constellation_stats = _constellation_stats_once(constellation)
+        if constellation_stats and 'satellites' in constellation_stats:
+            satellite_data = constellation_stats['satellites']
+        elif satellite:
+            satellite_data = [{
                 'satellite_id': 'LEO-1',
                 'name': 'LEO Satellite 1',
                 'cache_utilization': len(satellite.cache) / satellite.cache_size if satellite.cache_size else 0,
@@ -972,29 +1427,22 @@ def satellite_status():
                 'connected': True,
                 'signal_strength': 'Strong',
                 'latency_ms': 15
-            })
-        
-        # Try to get constellation data if available
-        constellation = simulation_state.get('constellation')
-        if constellation:
-            stats = constellation.get_constellation_stats()
-            satellite_data = stats.get('satellites', satellite_data)
-        
-        connected_satellite_id = None
-        try:
-            connected_satellite_id = simulation_state.get('last_connected_satellite_by_user', {}).get(int(current_user.id))
-        except Exception:
-            connected_satellite_id = None
+            }]
+        else:
+            satellite_data = []
 
-        return jsonify({
+        response = jsonify({
             'satellites': satellite_data,
             'total_satellites': len(satellite_data),
-            'constellation_stats': constellation.get_constellation_stats() if constellation else None,
+            'constellation_stats': constellation_stats,
             'connection_status': 'connected' if satellite else 'disconnected',
             'connected_satellite_id': connected_satellite_id,
             'multi_satellite_enabled': bool(simulation_state.get('multi_satellite_enabled')),
             'caching_strategy': simulation_state.get('caching_strategy', 'LRU')
         })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     except Exception as e:
         return jsonify({'error': str(e), 'connection_status': 'error'}), 400
 
@@ -1003,7 +1451,7 @@ def satellite_status():
 def satellite_connection():
     """Check satellite connection status"""
     try:
-        satellite = simulation_state.get('satellite')
+        satellite = user_satellite(current_user.id)
         if satellite:
             return jsonify({
                 'connected': True,
@@ -1043,8 +1491,7 @@ def constellation_stats():
                 'message': 'Multi-satellite mode not enabled. Enable it from Multi-Satellite tab.'
             })
         
-        stats = constellation.get_constellation_stats()
-        return jsonify(stats)
+        return jsonify(_constellation_stats_once(constellation))
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -1054,7 +1501,7 @@ def geographic_distribution():
     """Get geographic distribution of requests and satellites"""
     try:
         constellation = simulation_state.get('constellation')
-        satellite = simulation_state.get('satellite')
+        satellite = user_satellite(current_user.id)
         
         data = {
             'satellites': [],
@@ -1062,16 +1509,13 @@ def geographic_distribution():
         }
         
         if constellation:
-            stats = constellation.get_constellation_stats()
-            data['satellites'] = stats.get('satellites', [])
+            data['satellites'] = _constellation_stats_once(constellation).get('satellites', [])
         
-        # Get request distribution by region (simplified)
+        # Get request distribution by region over the last 100 requests. Every request
+        # maps to 'Global' for now; with real geolocation this becomes a Counter over
+        # the entries' regions.
         if satellite and satellite.request_log:
-            for entry in satellite.request_log[-100:]:  # Last 100 requests
-                region = 'Global'  # Simplified - could be enhanced with actual geolocation
-                if region not in data['request_distribution']:
-                    data['request_distribution'][region] = 0
-                data['request_distribution'][region] += 1
+            data['request_distribution'] = {'Global': min(100, len(satellite.request_log))}
         
         return jsonify(data)
     except Exception as e:
@@ -1089,26 +1533,27 @@ def enable_multi_satellite():
         data = request.get_json() or {}
         num_satellites = int(data.get('num_satellites', 5))
         
-        # Create SimPy environment if not exists
-        if simulation_state['env'] is None:
-            simulation_state['env'] = simpy.Environment()
-        
-        # Create configuration
-        if simulation_state['config'] is None:
-            simulation_state['config'] = SimulationConfig()
-        
-        # Create constellation
-        constellation = create_leo_constellation(
-            simulation_state['env'],
-            simulation_state['config'],
-            num_satellites=num_satellites,
-            caching_strategy=simulation_state.get('caching_strategy', 'LRU')
-        )
-        
-        simulation_state['constellation'] = constellation
-        simulation_state['multi_satellite_enabled'] = True
-        
-        stats = constellation.get_constellation_stats()
+        with _state_lock:
+            # Create SimPy environment if not exists
+            if simulation_state['env'] is None:
+                simulation_state['env'] = simpy.Environment()
+            
+            # Create configuration
+            if simulation_state['config'] is None:
+                simulation_state['config'] = SimulationConfig()
+            
+            # Create constellation
+            constellation = create_leo_constellation(
+                simulation_state['env'],
+                simulation_state['config'],
+                num_satellites=num_satellites,
+                caching_strategy=simulation_state.get('caching_strategy', 'LRU')
+            )
+            
+            simulation_state['constellation'] = constellation
+            simulation_state['multi_satellite_enabled'] = True
+        
+        stats = _constellation_stats_once(constellation)
         
         return jsonify({
             'success': True,
@@ -1138,17 +1583,18 @@ def set_caching_strategy():
         # If multi-satellite constellation is enabled, rebuild it so satellites use the new strategy
         try:
             if simulation_state.get('multi_satellite_enabled'):
-                num_satellites = len(simulation_state.get('constellation').satellites) if simulation_state.get('constellation') else 5
-                if simulation_state.get('env') is None:
-                    simulation_state['env'] = simpy.Environment()
-                if simulation_state.get('config') is None:
-                    simulation_state['config'] = SimulationConfig()
-                simulation_state['constellation'] = create_leo_constellation(
-                    simulation_state['env'],
-                    simulation_state['config'],
-                    num_satellites=num_satellites,
-                    caching_strategy=strategy
-                )
+                with _state_lock:
+                    num_satellites = len(simulation_state.get('constellation').satellites) if simulation_state.get('constellation') else 5
+                    if simulation_state.get('env') is None:
+                        simulation_state['env'] = simpy.Environment()
+                    if simulation_state.get('config') is None:
+                        simulation_state['config'] = SimulationConfig()
+                    simulation_state['constellation'] = create_leo_constellation(
+                        simulation_state['env'],
+                        simulation_state['config'],
+                        num_satellites=num_satellites,
+                        caching_strategy=strategy
+                    )
         except Exception:
             pass
         
@@ -1164,14 +1610,13 @@ def set_caching_strategy():
 @login_required
 def get_caching_strategies():
     """Get available caching strategies and current selection"""
-    return jsonify({
-        'available_strategies': [
-            {'id': 'LRU', 'name': 'Least Recently Used', 'description': 'Evicts least recently accessed items'},
-            {'id': 'LFU', 'name': 'Least Frequently Used', 'description': 'Evicts least frequently accessed items'},
-            {'id': 'FIFO', 'name': 'First In First Out', 'description': 'Evicts oldest items first'},
-            {'id': 'ADAPTIVE', 'name': 'Adaptive', 'description': 'Automatically switches between strategies based on performance'}
-        ],
-        'current_strategy': simulation_state.get('caching_strategy', 'LRU')
+    return _json_bytes_response(_caching_strategies_body(simulation_state.get('caching_strategy', 'LRU')))
+
+@lru_cache(maxsize=8)
+def _caching_strategies_body(current_strategy):
+    return _json_bytes({
+        'available_strategies': CACHING_STRATEGIES,
+        'current_strategy': current_strategy
     })
 
 @app.route('/api/create_collaboration_session', methods=['POST'])
@@ -1269,14 +1714,12 @@ def multi_satellite_request():
             pass
         
         # Get content from catalog
-        from realistic_content_catalog import get_content_by_id
         content_item = get_content_by_id(content_id)
         
         if not content_item:
             return jsonify({'success': False, 'error': 'Content not found'}), 404
         
         # Convert ContentItem to Content for simulation
-        from enhanced_satellite_cdn import Content
         content = Content(
             content_id=content_item.content_id,
             size=content_item.size_mb,
@@ -1308,15 +1751,12 @@ def multi_satellite_request():
         # Determine actual strategy used by the satellite (handle ADAPTIVE)
         strategy_used = simulation_state.get('caching_strategy', 'LRU')
         strategy_current = None
-        try:
-            cache_stats_now = satellite.cache_policy.get_stats()
-            if cache_stats_now.get('adaptive'):
-                strategy_used = 'ADAPTIVE'
-                strategy_current = cache_stats_now.get('current_strategy', cache_stats_now.get('strategy'))
-            else:
-                strategy_used = cache_stats_now.get('strategy', strategy_used)
-        except Exception:
-            pass
+        cache_policy = getattr(satellite, 'cache_policy', None)
+        if isinstance(cache_policy, AdaptiveCache):
+            strategy_used = 'ADAPTIVE'
+            strategy_current = cache_policy.strategy
+        elif cache_policy is not None:
+            strategy_used = cache_policy.strategy
 
         return jsonify({
             'success': True,
@@ -1335,56 +1775,64 @@ def multi_satellite_request():
                 'size_mb': content_item.size_mb,
                 'description': content_item.description,
                 'category': content_item.category,
-                'received_at': datetime.utcnow().isoformat()
+                'received_at': datetime.utcnow()
             },
-            'constellation_stats': constellation.get_constellation_stats()
+            'constellation_stats': _constellation_stats_once(constellation)
         })
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+def init_database():
+    """Create tables, indexes, the default admin and the default satellites.
+
+    Shared by `python app.py` and the gunicorn entrypoint in wsgi.py; needs an app context.
+    """
+    # Create all database tables (and any missing indexes) including new models
+    ensure_schema_migrations()
+    create_default_admin()
+    
+    # Initialize default satellites if none exist
+    if db.session.scalar(db.select(SatelliteNode.id).limit(1)) is None:
+        default_satellites = [
+            SatelliteNode(
+                satellite_id='LEO-1',
+                name='LEO Satellite 1',
+                latitude=0.0,
+                longitude=0.0,
+                altitude=550.0,
+                cache_size=12,
+                status='active'
+            ),
+            SatelliteNode(
+                satellite_id='LEO-2',
+                name='LEO Satellite 2',
+                latitude=30.0,
+                longitude=60.0,
+                altitude=550.0,
+                cache_size=12,
+                status='active'
+            ),
+            SatelliteNode(
+                satellite_id='LEO-3',
+                name='LEO Satellite 3',
+                latitude=-30.0,
+                longitude=120.0,
+                altitude=550.0,
+                cache_size=12,
+                status='active'
+            )
+        ]
+        db.session.add_all(default_satellites)
+        db.session.commit()
+        print("Default satellites initialized")
+
 if __name__ == '__main__':
     with app.app_context():
-        # Create all database tables including new models
-        db.create_all()
-        create_default_admin()
-        
-        # Initialize default satellites if none exist
-        if SatelliteNode.query.count() == 0:
-            default_satellites = [
-                SatelliteNode(
-                    satellite_id='LEO-1',
-                    name='LEO Satellite 1',
-                    latitude=0.0,
-                    longitude=0.0,
-                    altitude=550.0,
-                    cache_size=12,
-                    status='active'
-                ),
-                SatelliteNode(
-                    satellite_id='LEO-2',
-                    name='LEO Satellite 2',
-                    latitude=30.0,
-                    longitude=60.0,
-                    altitude=550.0,
-                    cache_size=12,
-                    status='active'
-                ),
-                SatelliteNode(
-                    satellite_id='LEO-3',
-                    name='LEO Satellite 3',
-                    latitude=-30.0,
-                    longitude=120.0,
-                    altitude=550.0,
-                    cache_size=12,
-                    status='active'
-                )
-            ]
-            for sat in default_satellites:
-                db.session.add(sat)
-            db.session.commit()
-            print("Default satellites initialized")
+        init_database()
     
-    # Run with SocketIO for WebSocket support
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
+    # Run with SocketIO for WebSocket support. Development server only; the debug
+    # reloader forks a second process with its own simulation_state, so it is opt-in.
+    socketio.run(app, debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000,
+                 allow_unsafe_werkzeug=True)
@@ -6,16 +6,17 @@ Run this script before your presentation to ensure everything is working.
 
 import sys
 import os
+import importlib.util
 
 def check_python_version():
-    """Check if Python version is 3.8+"""
+    """Check if Python version is 3.10+"""
     print("🔍 Checking Python version...")
     version = sys.version_info
-    if version.major >= 3 and version.minor >= 8:
+    if version.major >= 3 and version.minor >= 10:
         print(f"✅ Python {version.major}.{version.minor}.{version.micro} - OK")
         return True
     else:
-        print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Need 3.8+")
+        print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Need 3.10+")
         return False
 
 def check_dependencies():
@@ -27,20 +28,19 @@ def check_dependencies():
         'flask_login',
         'flask_socketio',
         'simpy',
-        'pandas',
+        'pandas',  # view_database.py and live_simulation.py, not the web app
         'numpy',
         'matplotlib',
         'seaborn',
-        'werkzeug',
-        'eventlet'
+        'werkzeug'
     ]
     
     missing = []
     for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
+        # Locate the package without importing it
+        if importlib.util.find_spec(package.replace('-', '_')) is not None:
             print(f"✅ {package} - Installed")
-        except ImportError:
+        else:
             print(f"❌ {package} - Missing")
             missing.append(package)
     
@@ -149,7 +149,7 @@ def main():
         print("⚠️  Some checks failed. Please fix the issues above.")
         print("\nCommon fixes:")
         print("- Install dependencies: pip install -r requirements.txt")
-        print("- Check Python version: python --version (need 3.8+)")
+        print("- Check Python version: python --version (need 3.10+)")
         print("- If port 5000 in use, change port in app.py")
     print("=" * 50)
 
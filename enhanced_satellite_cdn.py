@@ -22,7 +22,8 @@ Date: 2025
 
 import simpy
 import random
-from collections import OrderedDict
+from itertools import accumulate
+from bisect import bisect
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -31,7 +32,7 @@ from datetime import datetime
 # ENTITY DEFINITIONS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Content:
     """
     Content entity representing digital content items that can be cached and delivered.
@@ -49,7 +50,7 @@ class Content:
     popularity: float = 1.0
     creation_time: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
     """
     Configuration parameters for the satellite CDN simulation.
@@ -94,8 +95,8 @@ class Satellite:
         self.config = config
         self.cache_size = config.cache_size
         
-        # LRU Cache Implementation using OrderedDict
-        self.cache: OrderedDict[str, Content] = OrderedDict()
+        # LRU cache: a plain dict in insertion order, least recently used first
+        self.cache: Dict[str, Content] = {}
         
         # Performance Metrics
         self.total_requests = 0
@@ -107,11 +108,24 @@ class Satellite:
         # Request Logging
         self.request_log: List[Dict] = []
         self.performance_log: List[Dict] = []
+        # Session whose database rows hold the full request log (set by the web app)
+        self.persisted_session_id: Optional[int] = None
         
         # Cache Statistics
         self.cache_utilization_history: List[float] = []
         self.hit_rate_history: List[float] = []
         
+    def __getstate__(self):
+        """Pickle without the SimPy environment (its process generators can't be pickled)"""
+        state = self.__dict__.copy()
+        state['env'] = state['env'].now
+        return state
+    
+    def __setstate__(self, state):
+        """Resume on a fresh environment starting at the pickled simulation time"""
+        self.__dict__.update(state)
+        self.env = simpy.Environment(initial_time=state['env'])
+    
     def request_content(self, content_id: str, content: Content, user_id: str) -> Dict:
         """
         Handle a content request using LRU caching strategy.
@@ -126,11 +140,12 @@ class Satellite:
         """
         self.total_requests += 1
         current_time = self.env.now
+        cache = self.cache
         
         # Check if content is in cache
-        if content_id in self.cache:
-            # Cache HIT - move to end (most recently used)
-            self.cache.move_to_end(content_id)
+        if content_id in cache:
+            # Cache HIT - re-insert at the end (most recently used)
+            cache[content_id] = cache.pop(content_id)
             self.cache_hits += 1
             status = 'Hit'
             delivery_source = 'Satellite Cache'
@@ -141,19 +156,20 @@ class Satellite:
             delivery_source = 'Ground Station'
             
             # If cache is full, remove least recently used item
-            if len(self.cache) >= self.cache_size:
+            if len(cache) >= self.cache_size:
                 # Remove the first item (least recently used)
-                evicted_content = self.cache.popitem(last=False)
+                evicted_content = cache.pop(next(iter(cache)))
                 self.cache_evictions += 1
             
             # Add new content to cache (most recently used)
-            self.cache[content_id] = content
+            cache[content_id] = content
         
         # Update delivery statistics
         self.total_content_delivered += content.size
         
         # Calculate current metrics
-        cache_utilization = len(self.cache) / self.cache_size
+        cached_items = len(cache)
+        cache_utilization = cached_items / self.cache_size
         hit_rate = (self.cache_hits / self.total_requests) * 100 if self.total_requests > 0 else 0
         
         # Create detailed log entry
@@ -165,7 +181,7 @@ class Satellite:
             'content_size': content.size,
             'status': status,
             'delivery_source': delivery_source,
-            'cache_size': len(self.cache),
+            'cache_size': cached_items,
             'cache_utilization': cache_utilization,
             'hit_rate': hit_rate,
             'total_requests': self.total_requests,
@@ -226,7 +242,8 @@ class Satellite:
 
 def user_request_process(env: simpy.Environment, satellite: Satellite, 
                         content_catalog: List[Content], user_id: str,
-                        config: SimulationConfig):
+                        config: SimulationConfig,
+                        cum_weights: Optional[List[float]] = None):
     """
     SimPy process that generates periodic content requests from a user.
     
@@ -239,21 +256,34 @@ def user_request_process(env: simpy.Environment, satellite: Satellite,
         content_catalog: List of available content items
         user_id: Unique identifier for this user
         config: Simulation configuration
+        cum_weights: Running totals of content popularity in catalog order, so
+            several user processes can share one table (built here if omitted)
     """
     
     # Create popularity-weighted content selection
-    content_weights = [content.popularity for content in content_catalog]
+    # Cumulative weights built once so each draw is a bisect instead of an O(N) rescan
+    if cum_weights is None:
+        cum_weights = list(accumulate(content.popularity for content in content_catalog))
+    total_weight = cum_weights[-1] + 0.0
+    last_index = len(cum_weights) - 1
+    draw = random.random
+    # Loop-invariant lookups bound once (env.now changes, so it stays an attribute)
+    request_content = satellite.request_content
+    timeout = env.timeout
+    duration = config.simulation_duration
+    interval = config.request_interval
     
-    while env.now < config.simulation_duration:
+    while env.now < duration:
         try:
-            # Select content based on popularity weights
-            selected_content = random.choices(content_catalog, weights=content_weights)[0]
+            # Select content based on popularity weights: the same draw
+            # random.choices(k=1) makes, without building a result list per call
+            selected_content = content_catalog[bisect(cum_weights, draw() * total_weight, 0, last_index)]
             
             # Make request to satellite
-            log_entry = satellite.request_content(selected_content.content_id, selected_content, user_id)
+            request_content(selected_content.content_id, selected_content, user_id)
             
             # Wait before next request
-            yield env.timeout(config.request_interval)
+            yield timeout(interval)
             
         except simpy.Interrupt:
             print(f"User {user_id} request process interrupted")
@@ -25,6 +25,7 @@ import threading
 import time
 import json
 from collections import OrderedDict, deque
+from itertools import accumulate
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -228,7 +229,7 @@ def create_live_content_catalog() -> List[LiveContent]:
 def live_user_process(env: simpy.Environment, satellite: LiveSatellite, 
                      content_catalog: List[LiveContent], user_id: str):
     """Enhanced user process with live data generation"""
-    content_weights = [content.popularity for content in content_catalog]
+    cum_weights = list(accumulate(content.popularity for content in content_catalog))
     
     while simulation_state['running']:
         try:
@@ -238,7 +239,7 @@ def live_user_process(env: simpy.Environment, satellite: LiveSatellite,
                 continue
             
             # Select content based on popularity
-            selected_content = random.choices(content_catalog, weights=content_weights)[0]
+            selected_content = random.choices(content_catalog, cum_weights=cum_weights)[0]
             
             # Make request
             log_entry = satellite.request_content(selected_content, user_id)
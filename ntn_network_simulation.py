@@ -14,9 +14,9 @@ Team Members:
 import simpy
 import time
 import math
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 from realistic_content_catalog import ContentItem, REALISTIC_CONTENT_CATALOG, get_content_by_id
 
@@ -73,8 +73,8 @@ class LRUCache:
         self.misses += 1
         return None
     
-    def put(self, content_id: str, content: ContentItem):
-        """Add content to cache"""
+    def put(self, content_id: str, content: ContentItem, size: float = 0):
+        """Add content to cache (size is accepted for API parity and ignored)"""
         if content_id in self.cache:
             # Update existing
             self.cache.move_to_end(content_id)
@@ -123,6 +123,9 @@ def _create_cache(strategy: str, capacity: int):
         return AdaptiveCache(capacity)
     return AdvLRUCache(capacity)
 
+# The on-demand node serves requests for as long as the app runs; keep only the newest entries
+REQUEST_LOG_MAXLEN = 10000
+
 class SatelliteNode:
     """Realistic satellite node with proper NTN functionality"""
     
@@ -136,7 +139,7 @@ class SatelliteNode:
         # Statistics
         self.total_requests = 0
         self.total_content_delivered_mb = 0.0
-        self.request_log: List[Dict] = []
+        self.request_log: Deque[Dict] = deque(maxlen=REQUEST_LOG_MAXLEN)
         
         # Connection status
         self.connected = True
@@ -204,7 +207,7 @@ class SatelliteNode:
         
         cached_content = self.cache.get(content_id)
         
-        if cached_content:
+        if cached_content is not None:
             # Cache HIT - deliver from satellite (FAST PATH)
             steps.append({
                 'time': current_time,
@@ -344,7 +347,7 @@ class SatelliteNode:
                 
                 # Cache the content (with LRU eviction if needed)
                 cache_before = len(self.cache.cache)
-                self.cache.put(content_id, content)
+                self.cache.put(content_id, content, content.size_mb)
                 cache_after = len(self.cache.cache)
                 evicted = cache_before == cache_after and cache_before == self.cache.capacity
                 
@@ -442,6 +445,14 @@ class SatelliteNode:
             'altitude_km': self.altitude_km
         }
 
+# Size filters offered by the content browser: bucket label -> [low, high) in MB
+CONTENT_SIZE_BUCKETS = {
+    '0-10': (0, 10),
+    '10-50': (10, 50),
+    '50-100': (50, 100),
+    '100+': (100, float('inf')),
+}
+
 class NTNSimulation:
     """Main NTN simulation controller"""
     
@@ -450,18 +461,11 @@ class NTNSimulation:
         self.caching_strategy = (caching_strategy or "LRU").upper()
         self.satellite = SatelliteNode(self.env, "LEO-1", cache_size, caching_strategy=self.caching_strategy)
         self.content_catalog = REALISTIC_CONTENT_CATALOG
+        self._index_content()
     
-    def simulate_request(self, content_id: str, user_id: str) -> Dict:
-        """Simulate a single content request"""
-        result = self.satellite.request_content(content_id, user_id)
-        # Advance simulation time
-        if result['delivery_time'] > 0:
-            self.env.run(until=self.env.now + result['delivery_time'])
-        return result
-    
-    def get_available_content(self) -> List[Dict]:
-        """Get list of available content"""
-        return [
+    def _index_content(self):
+        """Build the catalog listing once, bucketed by content type and size filter"""
+        self._available_content = [
             {
                 'content_id': item.content_id,
                 'title': item.title,
@@ -472,6 +476,32 @@ class NTNSimulation:
             }
             for item in self.content_catalog
         ]
+        self._content_by_type: Dict[str, List[Dict]] = {}
+        self._content_ids_by_size: Dict[str, set] = {bucket: set() for bucket in CONTENT_SIZE_BUCKETS}
+        for entry in self._available_content:
+            self._content_by_type.setdefault(entry['type'], []).append(entry)
+            for bucket, (low, high) in CONTENT_SIZE_BUCKETS.items():
+                if low <= entry['size_mb'] < high:
+                    self._content_ids_by_size[bucket].add(entry['content_id'])
+    
+    def simulate_request(self, content_id: str, user_id: str) -> Dict:
+        """Simulate a single content request"""
+        result = self.satellite.request_content(content_id, user_id)
+        # Advance simulation time
+        if result['delivery_time'] > 0:
+            self.env.run(until=self.env.now + result['delivery_time'])
+        return result
+    
+    def get_available_content(self, content_type: str = '', size_bucket: str = '') -> List[Dict]:
+        """Get list of available content, optionally filtered by type and size bucket.
+        
+        An unknown size bucket applies no size filter; an unknown type matches nothing.
+        """
+        content = self._content_by_type.get(content_type, []) if content_type else self._available_content
+        size_ids = self._content_ids_by_size.get(size_bucket)
+        if size_ids is not None:
+            content = [entry for entry in content if entry['content_id'] in size_ids]
+        return content
     
     def get_statistics(self) -> Dict:
         """Get simulation statistics"""
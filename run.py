@@ -31,8 +31,8 @@ def print_banner():
 
 def check_python_version():
     """Check if Python version is compatible"""
-    if sys.version_info < (3, 8):
-        print("❌ Error: Python 3.8 or higher is required!")
+    if sys.version_info < (3, 10):
+        print("❌ Error: Python 3.10 or higher is required!")
         print(f"Current version: {sys.version}")
         print("Please upgrade Python and try again.")
         return False
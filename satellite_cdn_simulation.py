@@ -15,6 +15,7 @@ import random
 import csv
 import time
 from collections import OrderedDict
+from itertools import accumulate
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from content_data import CONTENT_CATALOG
@@ -169,12 +170,12 @@ def user_request_process(env: simpy.Environment, satellite: Satellite,
     """
     
     # Create popularity-weighted content selection
-    content_weights = [content.popularity for content in content_catalog]
+    cum_weights = list(accumulate(content.popularity for content in content_catalog))
     
     while env.now < simulation_duration:
         try:
             # Select content based on popularity weights
-            selected_content = random.choices(content_catalog, weights=content_weights)[0]
+            selected_content = random.choices(content_catalog, cum_weights=cum_weights)[0]
             
             # Make request to satellite
             log_entry = satellite.request_content(selected_content.content_id, selected_content)
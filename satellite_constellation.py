@@ -13,9 +13,9 @@ Team Members:
 import simpy
 import random
 import math
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 from enhanced_satellite_cdn import Satellite, SimulationConfig, Content
 
@@ -50,6 +50,9 @@ class SatellitePosition:
         alt_diff = abs(self.altitude - other.altitude)
         return math.sqrt(lat_diff**2 + lon_diff**2 + alt_diff**2)
 
+# Constellation satellites serve on-demand requests indefinitely; keep only the newest log entries
+REQUEST_LOG_MAXLEN = 10000
+
 class ConstellationSatellite(Satellite):
     """Enhanced satellite with constellation support"""
     
@@ -61,6 +64,7 @@ class ConstellationSatellite(Satellite):
         self.constellation = None  # Will be set by Constellation
         self.inter_satellite_requests = 0
         self.inter_satellite_hits = 0
+        self.request_log: Deque[Dict] = deque(maxlen=REQUEST_LOG_MAXLEN)
         self.caching_strategy = (caching_strategy or "LRU").upper()
         # Override base OrderedDict cache with advanced cache implementation
         self.cache_policy = _create_constellation_cache(self.caching_strategy, self.cache_size)
@@ -86,7 +90,7 @@ class ConstellationSatellite(Satellite):
                 neighbor_content = neighbor.cache_policy.get(content_id)
                 if neighbor_content is None:
                     neighbor_content = content
-                self.cache_policy.put(content_id, neighbor_content)
+                self.cache_policy.put(content_id, neighbor_content, content.size)
                 
                 return {
                     'status': 'Neighbor Hit',
@@ -101,7 +105,7 @@ class ConstellationSatellite(Satellite):
         """Enhanced request with inter-satellite support"""
         self.total_requests += 1
         current_time = self.env.now
-        strategy_name = self.cache_policy.get_stats().get('strategy', self.caching_strategy)
+        strategy_name = self.cache_policy.strategy
         
         # Check local cache first
         if self.cache_policy.contains(content_id):
@@ -123,9 +127,9 @@ class ConstellationSatellite(Satellite):
                 status = 'Miss'
                 delivery_source = 'Ground Station'
                 # Add to cache via selected strategy
-                before_evictions = self.cache_policy.get_stats().get('evictions', 0)
-                self.cache_policy.put(content_id, content)
-                after_evictions = self.cache_policy.get_stats().get('evictions', 0)
+                before_evictions = self.cache_policy.evictions
+                self.cache_policy.put(content_id, content, content.size)
+                after_evictions = self.cache_policy.evictions
                 if after_evictions > before_evictions:
                     self.cache_evictions += (after_evictions - before_evictions)
         
@@ -133,8 +137,7 @@ class ConstellationSatellite(Satellite):
         self.total_content_delivered += content.size
         
         # Calculate metrics
-        cache_stats = self.cache_policy.get_stats()
-        cache_utilization = (cache_stats.get('utilization', 0) / 100) if cache_stats.get('utilization', None) is not None else 0
+        cache_utilization = self.cache_policy.utilization / 100
         hit_rate = (self.cache_hits / self.total_requests) * 100 if self.total_requests > 0 else 0
         
         # Create log entry
@@ -147,7 +150,7 @@ class ConstellationSatellite(Satellite):
             'status': status,
             'delivery_source': delivery_source,
             'satellite_id': self.satellite_id,
-            'cache_size': cache_stats.get('size', 0),
+            'cache_size': len(self.cache_policy.cache),
             'cache_utilization': cache_utilization,
             'hit_rate': hit_rate,
             'total_requests': self.total_requests,
@@ -168,6 +171,8 @@ class SatelliteConstellation:
         self.config = config
         self.satellites: List[ConstellationSatellite] = []
         self.satellite_map: Dict[str, ConstellationSatellite] = {}
+        # Positions are fixed, so neighbour lists only change when satellites are added
+        self._nearest_cache: Dict[Tuple[str, float], List[ConstellationSatellite]] = {}
         
     def add_satellite(self, satellite_id: str, position: SatellitePosition, caching_strategy: str = "LRU") -> ConstellationSatellite:
         """Add a satellite to the constellation"""
@@ -175,11 +180,17 @@ class SatelliteConstellation:
         satellite.constellation = self
         self.satellites.append(satellite)
         self.satellite_map[satellite_id] = satellite
+        self._nearest_cache.clear()
         return satellite
     
     def get_nearest_satellites(self, reference: ConstellationSatellite, 
                                max_distance: float = 1000) -> List[ConstellationSatellite]:
         """Get nearest satellites to a reference satellite"""
+        key = (reference.satellite_id, max_distance)
+        nearest = self._nearest_cache.get(key)
+        if nearest is not None:
+            return nearest
+        
         distances = []
         for sat in self.satellites:
             if sat.satellite_id == reference.satellite_id:
@@ -190,7 +201,8 @@ class SatelliteConstellation:
         
         # Sort by distance
         distances.sort(key=lambda x: x[0])
-        return [sat for _, sat in distances[:3]]  # Return top 3 nearest
+        nearest = self._nearest_cache[key] = [sat for _, sat in distances[:3]]  # Top 3 nearest
+        return nearest
     
     def get_satellite_by_id(self, satellite_id: str) -> Optional[ConstellationSatellite]:
         """Get satellite by ID"""
@@ -202,12 +214,7 @@ class SatelliteConstellation:
         total_hits = sum(s.cache_hits for s in self.satellites)
         total_inter_satellite_hits = sum(s.inter_satellite_hits for s in self.satellites)
         # Strategy may vary for Adaptive; show per-satellite and an overall label
-        strategies = []
-        for s in self.satellites:
-            try:
-                strategies.append(s.cache_policy.get_stats().get('strategy', getattr(s, 'caching_strategy', 'LRU')))
-            except Exception:
-                strategies.append(getattr(s, 'caching_strategy', 'LRU'))
+        strategies = [s.cache_policy.strategy for s in self.satellites]
         overall_strategy = strategies[0] if strategies else 'LRU'
         if any(st != overall_strategy for st in strategies):
             overall_strategy = 'ADAPTIVE'
@@ -228,11 +235,11 @@ class SatelliteConstellation:
                     'longitude': s.position.longitude,
                     'altitude': s.position.altitude
                 },
-                'cache_utilization': (s.cache_policy.get_stats().get('utilization', 0) / 100) if s.cache_size > 0 else 0,
+                'cache_utilization': (s.cache_policy.utilization / 100) if s.cache_size > 0 else 0,
                 'hit_rate': (s.cache_hits / s.total_requests * 100) if s.total_requests > 0 else 0,
                 'total_requests': s.total_requests,
-                'caching_strategy': (s.cache_policy.get_stats().get('strategy', getattr(s, 'caching_strategy', 'LRU')))
-            } for s in self.satellites]
+                'caching_strategy': strategy
+            } for s, strategy in zip(self.satellites, strategies)]
         }
     
     def assign_user_to_satellite(self, user_id: str) -> ConstellationSatellite:
@@ -0,0 +1,106 @@
+from advanced_caching import LRUCache, LFUCache, FIFOCache, AdaptiveCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'
+
+    cache.put('c', 'C')
+
+    assert cache.contains('a')
+    assert not cache.contains('b')
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_lfu_evicts_least_frequent_then_oldest():
+    cache = LFUCache(3)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    cache.put('c', 'C')
+    cache.get('a')
+    cache.get('a')
+    cache.get('c')
+
+    # 'b' has the lowest frequency
+    cache.put('d', 'D')
+    assert not cache.contains('b')
+
+    # 'd' and 'c' would tie after this get; 'c' reached frequency 2 first
+    cache.get('d')
+    cache.put('e', 'E')
+    assert not cache.contains('c')
+    assert cache.contains('a') and cache.contains('d') and cache.contains('e')
+
+
+def test_fifo_ignores_access_order():
+    cache = FIFOCache(2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    cache.get('a')
+
+    cache.put('c', 'C')
+
+    assert not cache.contains('a')
+    assert cache.contains('b') and cache.contains('c')
+
+
+def test_tinylfu_rejects_one_hit_scan():
+    cache = LRUCache(2, tinylfu=True)
+    for _ in range(5):
+        for cid in ('a', 'b'):
+            if cache.get(cid) is None:
+                cache.put(cid, cid.upper())
+
+    # A one-off item is less popular than the LRU victim, so it is not admitted
+    cache.put('scan', 'SCAN')
+
+    assert not cache.contains('scan')
+    assert cache.contains('a') and cache.contains('b')
+    assert cache.get_stats()['evictions'] == 0
+
+
+def test_adaptive_counts_falsy_payloads_as_hits():
+    cache = AdaptiveCache(2)
+    cache.put('empty', b'')
+
+    assert cache.get('empty') == b''
+    assert cache.get('missing') is None
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['strategy_performance']['LRU']['hits'] == 1
+
+
+def test_bytes_used_follows_inserts_updates_and_evictions():
+    for cache_class in (LRUCache, LFUCache, FIFOCache, AdaptiveCache):
+        cache = cache_class(2)
+        cache.put('a', 'A', 10)
+        cache.put('b', 'B', 20)
+        cache.put('a', 'A2', 15)
+        assert cache.get_stats()['bytes_used'] == 35
+
+        cache.put('c', 'C', 5)
+        assert len(cache.cache) == 2
+        assert cache.bytes_used == sum(item.size for item in cache.cache.values())
+
+
+def test_lru_put_replaces_existing_content():
+    cache = LRUCache(2)
+    cache.put('a', 'old')
+    cache.put('a', 'new')
+
+    assert cache.get('a') == 'new'
+
+
+def test_lfu_update_counts_one_access_without_a_hit():
+    cache = LFUCache(2, tinylfu=True)
+    cache.put('a', 'A')
+    cache.put('a', 'A2')
+
+    assert cache.get_stats()['hits'] == 0
+    assert cache.cache['a'].access_count == 2
+    assert cache.admission.estimate('a') == 2
+    assert cache.get('a') == 'A2'
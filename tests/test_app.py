@@ -30,6 +30,12 @@ def login(client, username='admin', password='admin123'):
     }, follow_redirects=True)
 
 
+def admin_id(app_instance):
+    from app import User
+    with app_instance.app_context():
+        return User.query.filter_by(username='admin').first().id
+
+
 def test_admin_login_success(client):
     resp = login(client)
     assert resp.status_code == 200
@@ -59,7 +65,7 @@ def test_start_simulation_endpoint(client):
     assert isinstance(payload.get('session_id'), int)
 
 
-def test_simulation_status_and_results(client, monkeypatch):
+def test_simulation_status_and_results(app_instance, client, monkeypatch):
     # Force simulation_state to completed and set minimal satellite data
     from app import simulation_state
     class DummySatellite:
@@ -69,7 +75,7 @@ def test_simulation_status_and_results(client, monkeypatch):
         def get_final_statistics(self):
             return {'total_requests': 0}
     simulation_state['running'] = False
-    simulation_state['satellite'] = DummySatellite()
+    monkeypatch.setitem(simulation_state['satellite_by_user'], admin_id(app_instance), DummySatellite())
 
     login(client)
     status_resp = client.get('/simulation_status')
@@ -81,6 +87,16 @@ def test_simulation_status_and_results(client, monkeypatch):
     assert 'statistics' in results_resp.json
 
 
+def test_simulation_results_are_not_shared_between_users(app_instance, client, monkeypatch):
+    from app import simulation_state, ensure_runtime_satellite
+    monkeypatch.delitem(simulation_state['satellite_by_user'], admin_id(app_instance), raising=False)
+    ensure_runtime_satellite()
+
+    login(client)
+    payload = client.get('/simulation_results').get_json()
+    assert payload == {'error': 'No simulation results available'}
+
+
 def test_analytics_api(client):
     login(client)
     resp = client.get('/api/analytics')
@@ -90,3 +106,154 @@ def test_analytics_api(client):
         assert key in data
 
 
+def test_simulation_results_reuses_rendered_charts(app_instance, client, monkeypatch):
+    import app as app_module
+    app_module.run_simulation_background({
+        'simulation_duration': 20.0,
+        'request_interval': 1.0,
+        'log_interval': 5.0
+    }, admin_id(app_instance))
+    calls = []
+    original = app_module.generate_charts
+
+    def counting_generate_charts(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(app_module, 'generate_charts', counting_generate_charts)
+
+    login(client)
+    first = client.get('/simulation_results').get_json()
+    second = client.get('/simulation_results').get_json()
+
+    assert first['charts'] == second['charts']
+    assert 'hit_rate' in first['charts']
+    assert len(calls) == 1
+
+
+def test_background_simulation_streams_request_log_to_db(app_instance, monkeypatch):
+    import app as app_module
+    from app import db, ContentRequest, SimulationSession
+    monkeypatch.setattr(app_module, 'REQUEST_LOG_WINDOW', 5)
+    with app_instance.app_context():
+        sim_session = SimulationSession(user_id=1, config='{}', status='running')
+        db.session.add(sim_session)
+        db.session.commit()
+        session_id = sim_session.id
+
+    app_module.run_simulation_background({
+        'simulation_duration': 50.0,
+        'request_interval': 0.5,
+        'log_interval': 5.0
+    }, 1, session_id)
+    satellite = app_module.simulation_state['satellite_by_user'][1]
+
+    with app_instance.app_context():
+        stored = ContentRequest.query.filter_by(session_id=session_id).count()
+        content_type_counts, status_counts = app_module.request_counts(
+            satellite.request_log, satellite.persisted_session_id)
+
+    assert satellite.persisted_session_id == session_id
+    assert len(satellite.request_log) < satellite.total_requests
+    assert stored == satellite.total_requests
+    assert sum(status_counts.values()) == satellite.total_requests
+
+
+def test_load_user_serves_cached_snapshot_until_user_changes(app_instance):
+    from sqlalchemy import event
+    from app import db, load_user, User
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    with app_instance.app_context():
+        admin_id = User.query.filter_by(username='admin').first().id
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+        try:
+            load_user(str(admin_id))
+            db.session.remove()
+            before = len(statements)
+            cached = load_user(str(admin_id))
+            assert len(statements) == before
+            assert cached.username == 'admin'
+
+            cached.last_login = None
+            db.session.commit()
+            db.session.remove()
+            before = len(statements)
+            load_user(str(admin_id))
+            assert len(statements) > before
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+
+def test_satellite_status_revalidates_with_etag(app_instance, client):
+    from app import user_satellite, ensure_runtime_satellite
+    login(client)
+    first = client.get('/api/satellite_status')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    unchanged = client.get('/api/satellite_status', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+
+    satellite = user_satellite(admin_id(app_instance)) or ensure_runtime_satellite()
+    satellite.total_requests += 1
+    try:
+        changed = client.get('/api/satellite_status', headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+    finally:
+        satellite.total_requests -= 1
+
+
+def test_simulation_results_can_return_chart_series(app_instance, client, monkeypatch):
+    import app as app_module
+    app_module.run_simulation_background({
+        'simulation_duration': 20.0,
+        'request_interval': 1.0,
+        'log_interval': 5.0
+    }, admin_id(app_instance))
+
+    def fail_generate_charts(*args):
+        raise AssertionError('series requests must not render charts')
+
+    monkeypatch.setattr(app_module, 'generate_charts', fail_generate_charts)
+
+    login(client)
+    payload = client.get('/simulation_results?charts=data').get_json()
+
+    assert payload['chart_format'] == 'data'
+    series = payload['charts']
+    assert len(series['timestamps']) == len(series['hit_rate']) == payload['performance_count']
+    assert sum(series['request_status'].values()) == sum(series['content_distribution'].values())
+
+
+def test_schema_migrations_can_rerun_with_expression_indexes(app_instance, capsys):
+    from app import ensure_schema_migrations
+    with app_instance.app_context():
+        ensure_schema_migrations()
+        ensure_schema_migrations()
+    assert 'Schema migration check failed' not in capsys.readouterr().out
+
+
+def test_failed_simulation_marks_session_failed(app_instance):
+    from concurrent.futures import Future
+    import app as app_module
+    from app import db, SimulationSession
+    with app_instance.app_context():
+        sim_session = SimulationSession(user_id=1, config='{}', status='running')
+        db.session.add(sim_session)
+        db.session.commit()
+        session_id = sim_session.id
+    app_module.simulation_state['running_sessions'][1] = session_id
+    future = Future()
+    future.set_exception(RuntimeError('worker failed'))
+
+    app_module._on_simulation_done(1, session_id, None, future)
+
+    with app_instance.app_context():
+        assert db.session.get(SimulationSession, session_id).status == 'failed'
+    assert 1 not in app_module.simulation_state['running_sessions']
@@ -21,11 +21,11 @@ def check_python_version():
     """Check if Python version is compatible"""
     print("🐍 Checking Python version...")
     version = sys.version_info
-    if version.major >= 3 and version.minor >= 8:
+    if version.major >= 3 and version.minor >= 10:
         print(f"✅ Python {version.major}.{version.minor}.{version.micro} - Compatible")
         return True
     else:
-        print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Requires Python 3.8+")
+        print(f"❌ Python {version.major}.{version.minor}.{version.micro} - Requires Python 3.10+")
         return False
 
 def check_dependencies():
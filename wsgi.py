@@ -0,0 +1,15 @@
+"""
+WSGI entrypoint for running the Orbital CDN app under gunicorn
+==============================================================
+
+    gunicorn -k gthread -w 1 --threads 64 -b 0.0.0.0:5000 wsgi:app
+
+Keep a single worker process: simulation state, caches and Socket.IO
+sessions live in process memory. Concurrency comes from the threads, which
+matches the SocketIO 'threading' async mode used by app.py.
+"""
+
+from app import app, init_database
+
+with app.app_context():
+    init_database()